@@ -34,8 +34,9 @@ def parse_args():
 
 def clear_scene():
     """Remove all objects from scene."""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+    # Data API instead of select_all + delete: no operator poll/undo push
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
     print("✓ Scene cleared")
 
 def create_character_placeholder(description):
@@ -0,0 +1,62 @@
+"""
+Scene helpers shared by the character-creation Cycles renderers
+(render_static_character.py, render_variations.py).
+
+Runs inside Blender; the scripts put this directory on sys.path before
+importing it.
+"""
+
+import bpy
+import numpy as np
+
+
+def get_mesh_bounds():
+    """Return the world-space (min, max) corners over all mesh objects."""
+    min_co = np.full(3, np.inf)
+    max_co = np.full(3, -np.inf)
+    
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            # Arvo's AABB transform: move the box center, grow the half-extents
+            # by |R| - two mat-vec products instead of eight corner transforms.
+            # bound_box[0] and [6] are the local min/max corners.
+            local_min = np.array(obj.bound_box[0], dtype=np.float64)
+            local_max = np.array(obj.bound_box[6], dtype=np.float64)
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            rot = matrix[:3, :3]
+            world_center = rot @ ((local_min + local_max) / 2) + matrix[:3, 3]
+            world_extent = np.abs(rot) @ ((local_max - local_min) / 2)
+            np.minimum(min_co, world_center - world_extent, out=min_co)
+            np.maximum(max_co, world_center + world_extent, out=max_co)
+    
+    return min_co, max_co
+
+
+def enable_gpu_devices(scene):
+    """
+    Point Cycles at the GPU, preferring OptiX over CUDA.
+    
+    Setting compute_device_type alone does not enable any device; each one
+    must be switched on after get_devices(). Falls back to CPU if no GPU
+    is found.
+    
+    Returns:
+        True if a GPU device was enabled
+    """
+    cycles_addon = bpy.context.preferences.addons.get('cycles')
+    if cycles_addon:
+        cycles_prefs = cycles_addon.preferences
+        for device_type in ('OPTIX', 'CUDA'):
+            try:
+                cycles_prefs.compute_device_type = device_type
+            except TypeError:
+                continue  # Backend not compiled into this Blender build
+            cycles_prefs.get_devices()
+            if any(d.type != 'CPU' for d in cycles_prefs.devices):
+                for device in cycles_prefs.devices:
+                    device.use = device.type != 'CPU'
+                scene.cycles.device = 'GPU'
+                return True
+    
+    scene.cycles.device = 'CPU'
+    return False
@@ -17,6 +17,11 @@ import argparse
 import os
 import math
 
+# Shared scene helpers live next to this script; Blender doesn't put the
+# script's directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from render_common import enable_gpu_devices, get_mesh_bounds
+
 
 def parse_args():
     """Parse command-line arguments."""
@@ -83,20 +88,11 @@ def setup_camera(target_obj, angle_degrees=45, distance_multiplier=2.5):
             bpy.data.objects.remove(obj, do_unlink=True)
     
     # Calculate object bounds
-    min_co = [float('inf')] * 3
-    max_co = [float('-inf')] * 3
-    
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            for v in obj.bound_box:
-                world_v = obj.matrix_world @ mathutils.Vector(v)
-                for i in range(3):
-                    min_co[i] = min(min_co[i], world_v[i])
-                    max_co[i] = max(max_co[i], world_v[i])
+    min_co, max_co = get_mesh_bounds()
     
     # Calculate center and size
-    center = [(min_co[i] + max_co[i]) / 2 for i in range(3)]
-    size = max(max_co[i] - min_co[i] for i in range(3))
+    center = (min_co + max_co) / 2
+    size = float((max_co - min_co).max())
     
     # Camera distance based on object size
     distance = size * distance_multiplier
@@ -146,12 +142,9 @@ def setup_render_settings(resolution, samples):
     scene.render.film_transparent = True
     
     # GPU if available
-    prefs = bpy.context.preferences.addons.get('cycles')
-    if prefs:
-        prefs.preferences.compute_device_type = 'CUDA'
-        bpy.context.scene.cycles.device = 'GPU'
+    device = "GPU" if enable_gpu_devices(scene) else "CPU"
     
-    print(f"✅ Render settings: {resolution}x{resolution}, {samples} samples")
+    print(f"✅ Render settings: {resolution}x{resolution}, {samples} samples ({device})")
 
 
 def add_simple_material():
@@ -26,6 +26,11 @@ import random
 import json
 import logging
 
+# Shared scene helpers live next to this script; Blender doesn't put the
+# script's directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from render_common import enable_gpu_devices, get_mesh_bounds
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
@@ -120,29 +125,22 @@ def setup_lighting(config):
     rim.rotation_euler = (math.radians(-45), 0, math.radians(180))
 
 
-def setup_camera(angle_degrees=45):
-    """Position camera at given angle."""
+def setup_camera(angle_degrees=45, bounds=None):
+    """
+    Position camera at given angle.
+    
+    Args:
+        angle_degrees: Orbit angle around the mesh (0 = front)
+        bounds: Precomputed (min, max) from get_mesh_bounds(); computed here if None
+    """
     import mathutils
     
-    # Remove existing cameras
-    for obj in list(bpy.data.objects):
-        if obj.type == 'CAMERA':
-            bpy.data.objects.remove(obj, do_unlink=True)
+    if bounds is None:
+        bounds = get_mesh_bounds()
+    min_co, max_co = bounds
     
-    # Calculate object bounds
-    min_co = [float('inf')] * 3
-    max_co = [float('-inf')] * 3
-    
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            for v in obj.bound_box:
-                world_v = obj.matrix_world @ mathutils.Vector(v)
-                for i in range(3):
-                    min_co[i] = min(min_co[i], world_v[i])
-                    max_co[i] = max(max_co[i], world_v[i])
-    
-    center = [(min_co[i] + max_co[i]) / 2 for i in range(3)]
-    size = max(max_co[i] - min_co[i] for i in range(3))
+    center = (min_co + max_co) / 2
+    size = float((max_co - min_co).max())
     distance = size * 2.5
     
     angle_rad = math.radians(angle_degrees)
@@ -150,9 +148,18 @@ def setup_camera(angle_degrees=45):
     cam_y = center[1] - distance * math.cos(angle_rad)
     cam_z = center[2] + size * 0.3
     
-    bpy.ops.object.camera_add(location=(cam_x, cam_y, cam_z))
-    camera = bpy.context.active_object
-    camera.name = "Render_Camera"
+    # Reuse the camera from the previous variation; only the first call
+    # clears the file's cameras and creates one
+    camera = bpy.data.objects.get("Render_Camera")
+    if camera is None or camera.type != 'CAMERA':
+        for obj in list(bpy.data.objects):
+            if obj.type == 'CAMERA':
+                bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.ops.object.camera_add()
+        camera = bpy.context.active_object
+        camera.name = "Render_Camera"
+    
+    camera.location = (cam_x, cam_y, cam_z)
     
     direction = mathutils.Vector(center) - camera.location
     rot_quat = direction.to_track_quat('-Z', 'Y')
@@ -212,12 +219,14 @@ def setup_render_settings(resolution, samples):
     scene.render.image_settings.color_mode = 'RGBA'
     scene.render.film_transparent = True
     
+    # Reuse the BVH and render data between variations - only materials,
+    # lights and the camera change
+    scene.render.use_persistent_data = True
+    
     # Try GPU
     try:
-        prefs = bpy.context.preferences.addons.get('cycles')
-        if prefs:
-            prefs.preferences.compute_device_type = 'CUDA'
-            scene.cycles.device = 'GPU'
+        if not enable_gpu_devices(scene):
+            logger.warning("No GPU found, rendering on CPU")
     except Exception as e:
         # DNA Fix: Log GPU setup error
         logger.warning(f"Could not enable GPU rendering: {e}")
@@ -249,6 +258,10 @@ def main():
     # Setup render settings (once)
     setup_render_settings(args.resolution, args.samples)
     
+    # Variations only change materials, lights and camera, so the mesh
+    # bounds are the same for every render - compute them once
+    bounds = get_mesh_bounds()
+    
     # Track metadata for each variation
     metadata = []
     
@@ -264,7 +277,7 @@ def main():
         # Apply variation
         colors = apply_color_variation(i)
         setup_lighting(lighting)
-        setup_camera(angle)
+        setup_camera(angle, bounds)
         
         # Render
         output_path = os.path.join(args.output_dir, f"variation_{i:03d}.png")
@@ -23,8 +23,8 @@ from flask_cors import CORS
 import subprocess
 import json
 from pathlib import Path
-from datetime import datetime
-import uuid
+from datetime import datetime, timezone
+import secrets
 import sys
 import webbrowser
 import threading
@@ -48,13 +48,13 @@ runpod.api_key = get_env_var('RUNPOD_API_KEY')
 # Add parent directory to path to import mission_control and cost_calculator
 sys.path.insert(0, str(Path(__file__).parent.parent / "shared" / "scripts"))
 
-from cost_calculator import CostCalculator
+from cost_calculator import get_calculator
 
 app = Flask(__name__)
 CORS(app)
 
 # Initialize cost calculator
-cost_calc = CostCalculator()
+cost_calc = get_calculator()
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -117,12 +117,14 @@ def upload_to_r2(local_path, r2_path):
 
 def create_job(job_type, params):
     """Create a job manifest and upload to R2"""
-    job_id = f"{job_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    ts_ms = time.time_ns() // 1_000_000
+    job_id = f"{job_type}_{ts_ms:013d}_{secrets.token_hex(4)}"
     
     manifest = {
         "job_id": job_id,
         "job_type": job_type,
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": datetime.fromtimestamp(ts_ms / 1000, timezone.utc).isoformat(),
+        "created_ts_ms": ts_ms,
         "status": "pending",
         "params": params
     }
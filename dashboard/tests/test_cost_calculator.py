@@ -7,6 +7,9 @@ Run with:
     python -m pytest tests/test_cost_calculator.py -v
 """
 
+import datetime
+import json
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -14,7 +17,15 @@ from pathlib import Path
 # Add shared directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared"))
 
-from cost_calculator import CostCalculator
+from cost_calculator import CostCalculator, _sidecar_path, get_calculator
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep config JSON sidecars out of the real user cache."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv('XDG_CACHE_HOME', str(path))
+    return path
 
 
 class TestCostCalculator:
@@ -235,6 +246,50 @@ class TestCostCalculator:
         is_safe, message = calculator.validate_cost(cost['total'])
         assert is_safe is True  # $8.25 is reasonable!
 
+    
+    def test_repeated_estimate_returns_fresh_copy(self, calculator):
+        """Test that cached estimates can't be corrupted by callers."""
+        first = calculator.estimate_cost('stability', '1024x1024', 50, 'sdxl', 10)
+        first['total'] = -1
+        first['breakdown']['steps'] = -1
+        
+        second = calculator.estimate_cost('stability', '1024x1024', 50, 'sdxl', 10)
+        
+        assert second['total'] > 0
+        assert second['breakdown']['steps'] == 50
+    
+    def test_resolution_spelling_variants(self, calculator):
+        """Test that equivalent resolution strings price the same."""
+        canonical = calculator.estimate_cost('stability', '1024x1024', 30, 'sdxl', 1)
+        variant = calculator.estimate_cost('stability', '1024 X 1024', 30, 'sdxl', 1)
+        unknown = calculator.estimate_cost('stability', 'huge', 30, 'sdxl', 1)
+        
+        assert variant['per_image'] == canonical['per_image']
+        assert unknown['breakdown']['resolution_multiplier'] == 1.0
+    
+    def test_batch_matches_single_estimates(self, calculator):
+        """Test that vectorized batch estimates match estimate_cost()."""
+        resolutions = ['512x512', '1024x1024', '2048x2048', '640x480']
+        steps = [30, 50, 100, 20]
+        models = ['sd_1_5', 'sdxl', 'sd_3', 'unknown_model']
+        counts = [1, 10, 500, 3]
+        
+        batch = calculator.estimate_costs_batch('stability', resolutions, steps, models, counts)
+        
+        for i in range(len(counts)):
+            single = calculator.estimate_cost('stability', resolutions[i], steps[i], models[i], counts[i])
+            assert batch['per_image'][i] == pytest.approx(single['per_image'])
+            assert batch['total'][i] == pytest.approx(single['total'])
+    
+    def test_batch_local_cost(self, calculator):
+        """Test that local batch estimates only scale with count."""
+        batch = calculator.estimate_costs_batch('local', [], [], [], [0, 1, 100])
+        single = calculator.estimate_cost('local', count=100)
+        
+        assert batch['total'][0] == 0.0
+        assert batch['per_image'][1] == batch['per_image'][2]
+        assert batch['total'][2] == pytest.approx(single['total'])
+
 
 class TestCostCalculatorEdgeCases:
     """Test edge cases and error handling."""
@@ -271,6 +326,101 @@ class TestCostCalculatorEdgeCases:
         assert is_safe is False
 
 
+class TestGetCalculator:
+    """Test the shared calculator factory."""
+    
+    def test_returns_shared_instance(self):
+        """Test that repeated calls reuse one calculator."""
+        assert get_calculator() is get_calculator()
+    
+    def test_separate_instance_per_config(self, tmp_path):
+        """Test that a different config path gets its own calculator."""
+        default = Path(__file__).parent.parent.parent / "shared" / "cost_config.yaml"
+        other = tmp_path / "cost_config.yaml"
+        other.write_text(default.read_text())
+        
+        assert get_calculator(str(other)) is not get_calculator()
+
+
+class TestConfigCache:
+    """Test that parsed configs are cached per file version."""
+    
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        """Copy of the default pricing config that tests can edit."""
+        default = Path(__file__).parent.parent.parent / "shared" / "cost_config.yaml"
+        path = tmp_path / "cost_config.yaml"
+        path.write_text(default.read_text())
+        return path
+    
+    def test_instances_get_independent_configs(self, config_file):
+        """Test that mutating one instance's config doesn't leak into the cache."""
+        first = CostCalculator(str(config_file))
+        first.limits['max_cost_per_job'] = -1
+        
+        second = CostCalculator(str(config_file))
+        assert second.limits['max_cost_per_job'] != -1
+    
+    def test_edited_config_is_reloaded(self, config_file):
+        """Test that a changed file is parsed again instead of served from cache."""
+        CostCalculator(str(config_file))
+        
+        config_file.write_text(config_file.read_text() + "\nextra_key: 1\n")
+        calculator = CostCalculator(str(config_file))
+        
+        assert calculator.config['extra_key'] == 1
+    
+    def test_json_sidecar_written(self, config_file, cache_home):
+        """Test that loading the YAML leaves a matching JSON sidecar in the cache dir."""
+        calculator = CostCalculator(str(config_file))
+        
+        sidecar = _sidecar_path(config_file.resolve())
+        assert sidecar.is_relative_to(cache_home)
+        assert json.loads(sidecar.read_text())['config'] == calculator.config
+        assert not config_file.with_suffix('.json').exists()
+    
+    def test_stale_json_sidecar_ignored(self, config_file):
+        """Test that a sidecar recorded for another version of the YAML is not used."""
+        stat = config_file.stat()
+        sidecar = _sidecar_path(config_file.resolve())
+        sidecar.parent.mkdir(parents=True)
+        sidecar.write_text(json.dumps({
+            'mtime_ns': stat.st_mtime_ns - 1, 'size': stat.st_size,
+            'config': {'providers': {}, 'limits': {}},
+        }))
+        
+        calculator = CostCalculator(str(config_file))
+        
+        assert 'stability' in calculator.providers
+    
+    def test_config_replaced_by_older_copy_is_reparsed(self, config_file):
+        """Test that swapping in a file with an older mtime (cp -p, rsync) isn't served stale."""
+        CostCalculator(str(config_file))
+        
+        config_file.write_text(config_file.read_text().replace("base_cost: 0.002", "base_cost: 0.020"))
+        os.utime(config_file, ns=(0, 0))
+        calculator = CostCalculator(str(config_file))
+        
+        assert calculator.providers['stability']['base_cost'] == 0.020
+    
+    def test_non_json_yaml_values_skip_sidecar(self, config_file):
+        """Test that YAML dates, which JSON can't hold, load without a sidecar."""
+        config_file.write_text(config_file.read_text() + "\nupdated: 2025-11-24\n")
+        
+        calculator = CostCalculator(str(config_file))
+        
+        assert calculator.config['updated'] == datetime.date(2025, 11, 24)
+        assert not _sidecar_path(config_file.resolve()).exists()
+    
+    def test_unwritable_cache_dir_skips_sidecar(self, config_file, cache_home):
+        """Test that a cache dir that can't be created doesn't break loading."""
+        cache_home.write_text("not a directory")
+        
+        calculator = CostCalculator(str(config_file))
+        
+        assert 'stability' in calculator.providers
+
+
 if __name__ == '__main__':
     # Run tests with pytest
     pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,168 @@
+"""
+Tests for Mission Control
+
+Run with:
+    cd dashboard
+    source venv/bin/activate
+    python -m pytest tests/test_mission_control.py -v
+"""
+
+import io
+import os
+import pytest
+import sys
+import tarfile
+from pathlib import Path
+
+# Add shared scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared" / "scripts"))
+
+from mission_control import MissionControl
+
+# Stands in for rclone, with $STUB_R2_ROOT as the bucket: copy, copyto and
+# cat, exiting 3 like rclone when the source doesn't exist
+STUB_RCLONE = f"""#!{sys.executable}
+import os, shutil, sys
+from pathlib import Path
+
+def local(path):
+    if ":" not in path:
+        return Path(path)
+    return Path(os.environ["STUB_R2_ROOT"]) / path.split(":", 1)[1].partition("/")[2]
+
+# mission_control passes `<command> <src> [<dst>]` first, then flags
+command, src = sys.argv[1], local(sys.argv[2])
+if not src.exists():
+    sys.exit(3)
+if command == "cat":
+    sys.stdout.write(src.read_text())
+    sys.exit(0)
+dst = local(sys.argv[3])
+if command == "copyto":
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(src, dst)
+elif src.is_dir():
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+else:
+    dst.mkdir(parents=True, exist_ok=True)
+    shutil.copy(src, dst)
+"""
+
+
+@pytest.fixture
+def r2_root(tmp_path, monkeypatch):
+    """Fake R2 bucket directory, with a stub rclone first on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    rclone = bin_dir / "rclone"
+    rclone.write_text(STUB_RCLONE)
+    rclone.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    
+    root = tmp_path / "r2"
+    monkeypatch.setenv('STUB_R2_ROOT', str(root))
+    return root
+
+
+class TestDownloadResults:
+    """Test that results come from bundle.tar when present, the directory otherwise."""
+    
+    def test_missing_bundle_falls_back_to_directory(self, r2_root, tmp_path):
+        """Test that a job without bundle.tar is copied file by file."""
+        job_dir = r2_root / "results" / "render_1700839845123_a1b2c3d4"
+        job_dir.mkdir(parents=True)
+        (job_dir / "frame_0001.png").write_bytes(b"png")
+        output_dir = tmp_path / "out"
+        
+        assert MissionControl().download_results(job_dir.name, output_dir)
+        
+        assert (output_dir / "frame_0001.png").read_bytes() == b"png"
+    
+    def test_bundle_is_extracted(self, r2_root, tmp_path):
+        """Test that bundle.tar is unpacked into the output directory."""
+        job_dir = r2_root / "results" / "render_1700839845123_a1b2c3d4"
+        job_dir.mkdir(parents=True)
+        with tarfile.open(job_dir / "bundle.tar", "w") as bundle:
+            info = tarfile.TarInfo("frame_0001.png")
+            info.size = 3
+            bundle.addfile(info, io.BytesIO(b"png"))
+        output_dir = tmp_path / "out"
+        
+        assert MissionControl().download_results(job_dir.name, output_dir)
+        
+        assert (output_dir / "frame_0001.png").read_bytes() == b"png"
+        assert not (output_dir / "bundle.tar").exists()
+
+
+
+class TestCreateJob:
+    """Test that a job only counts as created once its manifest is in R2."""
+    
+    @pytest.fixture
+    def mission_control(self, tmp_path):
+        """MissionControl writing its local manifests under tmp_path."""
+        mc = MissionControl()
+        mc.project_root = tmp_path
+        return mc
+    
+    def test_manifest_uploaded(self, r2_root, mission_control):
+        """Test that the manifest lands at jobs/pending/<job_id>.json."""
+        job_id, manifest_file = mission_control.create_job("render", {})
+        
+        uploaded = r2_root / "jobs" / "pending" / f"{job_id}.json"
+        assert uploaded.read_bytes() == manifest_file.read_bytes()
+    
+    def test_failed_upload_returns_no_job(self, r2_root, mission_control, tmp_path):
+        """Test that a manifest R2 never got is reported and not kept locally."""
+        r2_root.write_text("not a directory")  # every copy into R2 fails
+        
+        assert mission_control.create_job("render", {}) == (None, None)
+        assert not list((tmp_path / "data" / "jobs").iterdir())
+
+
+
+class TestUploadScriptsIfChanged:
+    """Test that scripts are uploaded only when R2's copy differs."""
+    
+    @pytest.fixture
+    def scripts_dir(self, tmp_path):
+        """A local scripts directory with one script in it."""
+        path = tmp_path / "scripts"
+        path.mkdir()
+        (path / "render.py").write_text("print('render')\n")
+        return path
+    
+    def test_first_upload_writes_fingerprint(self, r2_root, scripts_dir):
+        """Test that the scripts and a .fingerprint land in R2."""
+        assert MissionControl().upload_scripts_if_changed(scripts_dir, "pose-rendering/scripts")
+        
+        remote_dir = r2_root / "pose-rendering" / "scripts"
+        assert (remote_dir / "render.py").read_text() == "print('render')\n"
+        assert (remote_dir / ".fingerprint").read_text()
+    
+    def test_touched_but_unchanged_scripts_skipped(self, r2_root, scripts_dir):
+        """Test that a new mtime alone doesn't re-upload."""
+        MissionControl().upload_scripts_if_changed(scripts_dir, "pose-rendering/scripts")
+        remote_script = r2_root / "pose-rendering" / "scripts" / "render.py"
+        remote_script.unlink()
+        os.utime(scripts_dir / "render.py", ns=(0, 0))
+        
+        MissionControl().upload_scripts_if_changed(scripts_dir, "pose-rendering/scripts")
+        
+        assert not remote_script.exists()
+    
+    def test_remote_fingerprint_mismatch_uploads(self, r2_root, scripts_dir):
+        """Test that scripts uploaded from elsewhere are replaced."""
+        MissionControl().upload_scripts_if_changed(scripts_dir, "pose-rendering/scripts")
+        remote_dir = r2_root / "pose-rendering" / "scripts"
+        (remote_dir / "render.py").write_text("print('other machine')\n")
+        (remote_dir / ".fingerprint").write_text("other")
+        
+        MissionControl().upload_scripts_if_changed(scripts_dir, "pose-rendering/scripts")
+        
+        assert (remote_dir / "render.py").read_text() == "print('render')\n"
+
+
+if __name__ == '__main__':
+    # Run tests with pytest
+    pytest.main([__file__, '-v', '--tb=short'])
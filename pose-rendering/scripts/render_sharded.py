@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Parallel batch renderer: splits the character batch across Blender workers.
+
+Each worker is a headless Blender running render_simple_working.py with
+--shard k/N, so FBX parsing and Python-side scene setup run on N cores.
+Cap workers at 2-3 on GPU pods - more EEVEE instances just fight over VRAM.
+
+USAGE (on pod):
+    cd /workspace/pose-factory
+    python3 scripts/render_sharded.py --workers 3
+    python3 scripts/render_sharded.py --workers 2 -- --preview
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+RENDER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_simple_working.py")
+
+
+def launch_workers(workers, blender="blender", extra_args=()):
+    """
+    Start one Blender process per shard and wait for all of them.
+    
+    Returns:
+        0 if every shard succeeded, else a failing worker's exit code -
+        a signal death (negative, e.g. -9 from the OOM killer) first
+    """
+    procs = []
+    for shard_index in range(workers):
+        cmd = [
+            blender, "--background", "--python", RENDER_SCRIPT, "--",
+            "--batch", "--shard", f"{shard_index}/{workers}", *extra_args
+        ]
+        print(f"🚀 Worker {shard_index + 1}/{workers}: shard {shard_index}/{workers}")
+        procs.append(subprocess.Popen(cmd))
+    
+    codes = [proc.wait() for proc in procs]
+    failed = [code for code in codes if code != 0]
+    if not failed:
+        return 0
+    return min(failed) if min(failed) < 0 else failed[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the character batch across parallel Blender workers")
+    parser.add_argument("--workers", type=int, default=max(1, min(3, (os.cpu_count() or 2) // 2)),
+                        help="Number of Blender processes (default: min(3, cpu_count/2))")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("extra", nargs="*", help="Extra args passed to render_simple_working.py (after --)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    sys.exit(launch_workers(args.workers, args.blender, args.extra))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,20 @@ After hours of debugging, we found:
 - Don't "normalize" - just import and render!
 """
 
+import argparse
 import bpy
+import hashlib
 import sys
 import os
-import math
+import numpy as np
 import yaml
 from pathlib import Path
 
+# Pod layout; resolved once instead of repeating the literal per path
+WORKSPACE = "/workspace/pose-factory"
+FBX_DIR = os.path.join(WORKSPACE, "characters")
+OUTPUT_DIR = os.path.join(WORKSPACE, "output", "simple_multi_angle")
+
 def load_render_constants():
     """Load render constants from YAML config."""
     # Find project root (assume we are in pose-rendering/scripts/)
@@ -31,7 +38,157 @@ def load_render_constants():
                 return yaml.safe_load(f)
     return None
 
-def render_character_simple(fbx_path, output_dir, num_angles=8):
+def _blend_cache_path(fbx_path):
+    """
+    Cache .blend for an FBX, under $XDG_CACHE_HOME (~/.cache by default)
+    rather than next to the FBX, which may be read-only or a shared mount.
+    The absolute path's hash keeps same-named characters apart.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    fbx_path = os.path.abspath(fbx_path)
+    character_name = os.path.splitext(os.path.basename(fbx_path))[0]
+    digest = hashlib.sha1(fbx_path.encode()).hexdigest()[:16]
+    return os.path.join(cache_home, "3d-pose-factory", "blend_cache", f"{character_name}-{digest}.blend")
+
+def import_character(fbx_path):
+    """
+    Import a character FBX, reusing a .blend cache of the imported objects.
+    
+    FBX parsing takes seconds; appending the same objects from a .blend takes
+    tens of milliseconds. The cache (see _blend_cache_path) is rebuilt
+    whenever the FBX is newer than it; failing to write it only costs the
+    next run a full import.
+    """
+    cache_path = _blend_cache_path(fbx_path)
+    scene = bpy.context.scene
+    
+    # The previous character's meshes, materials and actions are left
+    # without users once its objects are removed; drop them so re-imports
+    # don't pile up Mesh.001, Mesh.002, ...
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(fbx_path):
+        print(f"\nAppending cached: {cache_path}")
+        with bpy.data.libraries.load(cache_path, link=False) as (data_from, data_to):
+            data_to.objects = data_from.objects
+        for obj in data_to.objects:
+            if obj is not None:
+                scene.collection.objects.link(obj)
+                # Written with a fake user; clear it so the purge above can
+                # reclaim this character once it's removed
+                obj.use_fake_user = False
+        return
+    
+    print(f"\nImporting: {fbx_path}")
+    existing = set(bpy.data.objects)
+    bpy.ops.import_scene.fbx(filepath=fbx_path)
+    imported = {obj for obj in bpy.data.objects if obj not in existing}
+    
+    # Writes the objects plus everything they use (meshes, armature, actions)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        bpy.data.libraries.write(cache_path, imported, fake_user=True)
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️  Could not write import cache {cache_path}: {e}")
+
+def compute_orbit_cameras(num_angles, distance, height):
+    """
+    Camera transforms for num_angles evenly spaced views around the origin.
+    
+    Angle 0 is the front (negative Y); angles go counter-clockwise seen from
+    above. On a level orbit every camera has the same tilt and its yaw is the
+    orbit angle itself, so no per-view track-to math is needed.
+    
+    Returns:
+        (positions, rotations): (N, 3) arrays of locations and XYZ Euler
+        rotations, ready to assign to camera.location / rotation_euler
+    """
+    angles_rad = np.arange(num_angles) * (2 * np.pi / num_angles)
+    
+    positions = np.empty((num_angles, 3))
+    positions[:, 0] = distance * np.sin(angles_rad)
+    positions[:, 1] = -distance * np.cos(angles_rad)  # Negative Y = in front
+    positions[:, 2] = height
+    
+    rotations = np.empty((num_angles, 3))
+    rotations[:, 0] = np.pi / 2 - np.arctan2(height, distance)
+    rotations[:, 1] = 0.0
+    rotations[:, 2] = angles_rad
+    
+    return positions, rotations
+
+def setup_scene(preview_mode=False, jpeg_output=False, resolution=None):
+    """
+    Reset the scene to a sun light and camera and apply render settings.
+    
+    Nothing here depends on the character, so batch runs call it once and
+    only swap the character objects between renders.
+    
+    Args:
+        preview_mode: Render with Workbench instead of EEVEE (much faster,
+            flat shading - fine for quick pose/silhouette checks)
+        jpeg_output: Save JPEG (quality 90) instead of PNG - Blender's PNG
+            encoder is single-threaded zlib and much slower to write
+        resolution: Square output size in pixels, overriding
+            render_constants.yaml (e.g. 128 for quick sanity checks)
+    """
+    constants = load_render_constants()
+    res_x = constants.get('resolution', {}).get('width', 512) if constants else 512
+    res_y = constants.get('resolution', {}).get('height', 512) if constants else 512
+    if resolution:
+        res_x = res_y = resolution
+    
+    # Clear scene (data API - skips operator poll/undo overhead)
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    
+    scene = bpy.context.scene
+    
+    # Setup lighting (same for all angles)
+    sun_data = bpy.data.lights.new(name="Sun", type='SUN')
+    sun_data.energy = 3.0
+    sun = bpy.data.objects.new("Sun", sun_data)
+    scene.collection.objects.link(sun)
+    sun.location = (5, 5, 10)
+    
+    # One camera, re-posed for every angle
+    camera_data = bpy.data.cameras.new(name="Camera")
+    camera = bpy.data.objects.new("Camera", camera_data)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    
+    # Render settings
+    scene.render.resolution_x = res_x
+    scene.render.resolution_y = res_y
+    if preview_mode:
+        # Workbench skips lighting/shading passes entirely
+        scene.render.engine = 'BLENDER_WORKBENCH'
+    else:
+        scene.render.engine = 'BLENDER_EEVEE'
+        scene.eevee.taa_render_samples = 16  # 64 was overkill for pose data
+        # AO, bloom and screen-space reflections add nothing to pose data.
+        # (EEVEE Next in Blender 4.2+ drops these toggles, hence hasattr.)
+        for effect in ('use_gtao', 'use_bloom', 'use_ssr'):
+            if hasattr(scene.eevee, effect):
+                setattr(scene.eevee, effect, False)
+    
+    if jpeg_output:
+        scene.render.image_settings.file_format = 'JPEG'
+        scene.render.image_settings.color_mode = 'RGB'
+        scene.render.image_settings.quality = 90
+    else:
+        scene.render.image_settings.file_format = 'PNG'
+    
+    # Only the camera moves between angles: keep render data (and GPU state)
+    # alive across renders and evaluate just the first view layer
+    scene.render.use_persistent_data = True
+    # Nothing edits the scene while a frame renders - skip UI/depsgraph syncing
+    scene.render.use_lock_interface = True
+    for layer_index, view_layer in enumerate(scene.view_layers):
+        view_layer.use = layer_index == 0
+
+def render_character_simple(fbx_path, output_dir, num_angles=8, preview_mode=False, jpeg_output=False,
+                            scene_ready=False, resolution=None):
     """
     Simple multi-angle render that ACTUALLY WORKS!
     
@@ -39,36 +196,42 @@ def render_character_simple(fbx_path, output_dir, num_angles=8):
         fbx_path: Path to Mixamo FBX
         output_dir: Where to save images
         num_angles: Number of camera angles (default 8)
+        preview_mode: Passed to setup_scene()
+        jpeg_output: Passed to setup_scene()
+        resolution: Passed to setup_scene()
+        scene_ready: setup_scene() has already run (batch mode) - just swap
+            out the previous character's meshes and armature
     """
     # Load constants
     constants = load_render_constants()
-    res_x = constants.get('resolution', {}).get('width', 512) if constants else 512
-    res_y = constants.get('resolution', {}).get('height', 512) if constants else 512
     camera_distance = constants.get('camera', {}).get('default_distance', 3.5) if constants else 3.5
     camera_height = constants.get('camera', {}).get('height', 1.6) if constants else 1.6
-
-    # Clear scene
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+    
+    if scene_ready:
+        for obj in list(bpy.data.objects):
+            if obj.type in {'ARMATURE', 'MESH'}:
+                bpy.data.objects.remove(obj, do_unlink=True)
+    else:
+        setup_scene(preview_mode, jpeg_output, resolution)
     
     # Import FBX - NO MODIFICATIONS!
-    print(f"\nImporting: {fbx_path}")
-    bpy.ops.import_scene.fbx(filepath=fbx_path)
+    import_character(fbx_path)
     
-    # Setup lighting (same for all angles)
-    bpy.ops.object.light_add(type='SUN', location=(5, 5, 10))
-    sun = bpy.context.active_object
-    sun.data.energy = 3.0
+    # An empty import or a missing camera would still cost a full render
+    # per angle, for blank frames
+    if not any(obj.type == 'MESH' for obj in bpy.data.objects):
+        print(f"⚠️  No meshes imported from {fbx_path}; skipping render")
+        return
     
-    # Render settings
     scene = bpy.context.scene
-    scene.render.resolution_x = res_x
-    scene.render.resolution_y = res_y
-    scene.render.engine = 'BLENDER_EEVEE'
-    scene.eevee.taa_render_samples = 64
+    camera = scene.camera
+    if camera is None:
+        print("⚠️  Scene has no camera; skipping render")
+        return
+    extension = ".jpg" if scene.render.image_settings.file_format == 'JPEG' else ".png"
     
     # Calculate angles
-    angles = [i * (360.0 / num_angles) for i in range(num_angles)]
+    angles = np.arange(num_angles) * (360.0 / num_angles)
     angle_names = {
         0: "front",
         45: "front_right",
@@ -79,58 +242,49 @@ def render_character_simple(fbx_path, output_dir, num_angles=8):
         270: "left",
         315: "front_left"
     }
+    friendly_names = [angle_names.get(int(a), f"{int(a)}deg") for a in angles]
     
     # Create output directory
     character_name = os.path.splitext(os.path.basename(fbx_path))[0]
     char_output_dir = os.path.join(output_dir, character_name)
     os.makedirs(char_output_dir, exist_ok=True)
+    prefix = char_output_dir + os.sep
+    output_paths = [f"{prefix}{name}{extension}" for name in friendly_names]
+    
+    positions, rotations = compute_orbit_cameras(num_angles, camera_distance, camera_height)
     
     print(f"\nRendering {num_angles} angles...")
     
     # Render from each angle
-    for i, angle_deg in enumerate(angles):
-        angle_rad = math.radians(angle_deg)
-        
-        # Camera position
-        cam_x = camera_distance * math.sin(angle_rad)
-        cam_y = -camera_distance * math.cos(angle_rad)  # Negative Y = in front
-        cam_z = camera_height
-        
-        # Create camera for this angle
-        bpy.ops.object.camera_add(location=(cam_x, cam_y, cam_z))
-        camera = bpy.context.active_object
-        camera.name = f"Camera_{i}"
-        
-        # Point camera at origin
-        direction = -camera.location.normalized()
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        camera.rotation_euler = rot_quat.to_euler()
-        
-        scene.camera = camera
+    for i, friendly_name in enumerate(friendly_names):
+        camera.location = positions[i]
+        camera.rotation_euler = rotations[i]
         
         # Render
-        friendly_name = angle_names.get(int(angle_deg), f"{int(angle_deg)}deg")
-        output_path = os.path.join(char_output_dir, f"{friendly_name}.png")
-        scene.render.filepath = output_path
+        scene.render.filepath = output_paths[i]
         bpy.ops.render.render(write_still=True)
         
         print(f"  ✓ [{i+1}/{num_angles}] {friendly_name}")
-        
-        # Delete camera for next angle
-        bpy.ops.object.select_all(action='DESELECT')
-        camera.select_set(True)
-        bpy.ops.object.delete()
     
     print(f"\n✓ Complete! Saved to: {char_output_dir}")
 
 
-def batch_render_simple(fbx_directory, output_dir, num_angles=8):
+def batch_render_simple(fbx_directory, output_dir, num_angles=8, preview_mode=False, shard=None,
+                        jpeg_output=False, resolution=None):
     """
     Batch render all FBX files in a directory.
+    
+    Args:
+        shard: Optional (index, count) - render only every count-th file
+            starting at index, so count Blender processes can split a batch
+            (see render_sharded.py)
     """
     import glob
     
-    fbx_files = glob.glob(os.path.join(fbx_directory, "*.fbx"))
+    fbx_files = sorted(glob.glob(os.path.join(fbx_directory, "*.fbx")))
+    if shard:
+        shard_index, shard_count = shard
+        fbx_files = fbx_files[shard_index::shard_count]
     
     if not fbx_files:
         print(f"No FBX files found in: {fbx_directory}")
@@ -140,11 +294,14 @@ def batch_render_simple(fbx_directory, output_dir, num_angles=8):
     print(f"BATCH RENDERING {len(fbx_files)} CHARACTERS")
     print(f"{'='*60}")
     
+    # Lights, camera and render settings are shared by every character
+    setup_scene(preview_mode, jpeg_output, resolution)
+    
     for i, fbx_path in enumerate(fbx_files):
         print(f"\n[{i+1}/{len(fbx_files)}] {os.path.basename(fbx_path)}")
         
         try:
-            render_character_simple(fbx_path, output_dir, num_angles)
+            render_character_simple(fbx_path, output_dir, num_angles, scene_ready=True)
         except Exception as e:
             print(f"⚠️  ERROR: {e}")
             continue
@@ -154,18 +311,67 @@ def batch_render_simple(fbx_directory, output_dir, num_angles=8):
     print(f"{'='*60}")
 
 
+def parse_args():
+    """
+    Parse the script arguments Blender passes after '--'.
+    
+    Without '--' (`blender -b -P render_simple_working.py --batch`, as older
+    runbooks have it) the known flags are picked out of the whole command
+    line instead, so they still take effect.
+    """
+    # No abbreviations: Blender's own options share the command line when
+    # there's no '--', and e.g. --b must not be read as --batch
+    parser = argparse.ArgumentParser(description="Multi-angle Mixamo character renderer",
+                                     allow_abbrev=False)
+    parser.add_argument("--batch", action="store_true",
+                        help=f"Render every FBX in {FBX_DIR}")
+    parser.add_argument("--preview", action="store_true",
+                        help="Fast Workbench render instead of EEVEE")
+    parser.add_argument("--jpeg", action="store_true",
+                        help="Save JPEG (quality 90) instead of PNG")
+    parser.add_argument("--num-angles", type=int, default=8,
+                        help="Camera angles per character")
+    parser.add_argument("--resolution", type=int, default=None,
+                        help="Square render size (default: render_constants.yaml)")
+    parser.add_argument("--shard", type=str, default=None,
+                        help="k/N: render the k-th of N slices of the batch")
+    
+    if "--" in sys.argv:
+        # pod_agent.sh also passes --characters/--output, which this script
+        # has never acted on - tolerate them (and anything else) instead of exiting
+        args, ignored = parser.parse_known_args(sys.argv[sys.argv.index("--") + 1:])
+        if ignored:
+            print(f"Ignoring unsupported arguments: {' '.join(ignored)}")
+    else:
+        # Everything else on the line is Blender's, so unknowns aren't reported
+        args, _ = parser.parse_known_args(sys.argv[1:])
+        if vars(args) != vars(parser.parse_args([])):
+            print("Note: no '--' separator; script flags belong after '--'")
+    
+    if args.shard:
+        try:
+            shard_index, shard_count = map(int, args.shard.split("/"))
+        except ValueError:
+            parser.error(f"--shard must look like k/N, got {args.shard!r}")
+        if not 0 <= shard_index < shard_count:
+            parser.error(f"--shard {args.shard}: need 0 <= k < N")
+        args.shard = (shard_index, shard_count)
+    
+    return args
+
+
 # Main execution
 if __name__ == "__main__":
-    # Check for batch mode flag
-    batch_mode = "--batch" in sys.argv
+    args = parse_args()
     
-    if batch_mode:
-        fbx_dir = "/workspace/pose-factory/characters"
-        output_dir = "/workspace/pose-factory/output/simple_multi_angle"
-        batch_render_simple(fbx_dir, output_dir, num_angles=8)
+    # Headless batch run - nothing will ever be undone
+    bpy.context.preferences.edit.use_global_undo = False
+    
+    if args.batch:
+        batch_render_simple(FBX_DIR, OUTPUT_DIR, num_angles=args.num_angles, preview_mode=args.preview,
+                            shard=args.shard, jpeg_output=args.jpeg, resolution=args.resolution)
     else:
         # Single character test
-        fbx_path = "/workspace/pose-factory/characters/X Bot.fbx"
-        output_dir = "/workspace/pose-factory/output/simple_multi_angle"
-        render_character_simple(fbx_path, output_dir, num_angles=8)
-
+        fbx_path = os.path.join(FBX_DIR, "X Bot.fbx")
+        render_character_simple(fbx_path, OUTPUT_DIR, num_angles=args.num_angles, preview_mode=args.preview,
+                                jpeg_output=args.jpeg, resolution=args.resolution)
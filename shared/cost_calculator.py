@@ -5,9 +5,9 @@ Calculates costs for different rendering providers (local GPU, Stability AI, Dre
 with precision to prevent explosive costs in batch processing.
 
 USAGE:
-    from cost_calculator import CostCalculator
+    from cost_calculator import get_calculator
     
-    calc = CostCalculator()
+    calc = get_calculator()  # shared instance - reuse it, don't rebuild it
     
     # Estimate cost
     cost = calc.estimate_cost(
@@ -22,9 +22,158 @@ USAGE:
     is_safe, message = calc.validate_cost(cost['total'])
 """
 
+import copy
+import functools
+import hashlib
+import json
+import os
+import numpy as np
 import yaml
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Sequence
+
+# libyaml's C loader when PyYAML was built with it, pure Python otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Parsed configs keyed by (resolved path, mtime, size) - editing the file
+# changes the key, so a stale entry is never returned
+_CONFIG_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 32
+
+
+def _sidecar_path(path: Path) -> Path:
+    """
+    JSON sidecar location for a config: under $XDG_CACHE_HOME (~/.cache by
+    default), never in the source tree. The resolved path's hash keeps
+    same-named configs from different directories apart.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:16]
+    return Path(cache_home) / '3d-pose-factory' / f"{path.stem}-{digest}.json"
+
+
+def _load_config_file(path: Path, stat: os.stat_result) -> Dict:
+    """
+    Parse a YAML config, going through a JSON sidecar when it is fresh.
+    
+    json.loads is several times faster than YAML parsing, so the first load
+    after each edit writes a sidecar to the user cache dir (_sidecar_path)
+    and later processes read that instead. The sidecar records the YAML's
+    mtime and size and is only used while both still match - the same key
+    _CONFIG_CACHE uses - so a file replaced by an older copy is re-parsed.
+    """
+    json_path = _sidecar_path(path)
+    try:
+        sidecar = json.loads(json_path.read_bytes())
+        if (sidecar['mtime_ns'], sidecar['size']) == (stat.st_mtime_ns, stat.st_size):
+            return sidecar['config']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+    
+    # YAML can produce values JSON can't hold (dates, non-string keys);
+    # such configs just don't get a sidecar
+    try:
+        dumped = json.dumps(config)
+    except (TypeError, ValueError):
+        return config
+    if json.loads(dumped) != config:
+        return config
+    
+    # Write-then-rename so a concurrent reader never sees a partial file;
+    # an unwritable cache dir just means no sidecar
+    tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.tmp")
+    try:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(
+            f'{{"mtime_ns": {stat.st_mtime_ns}, "size": {stat.st_size}, "config": {dumped}}}'
+        )
+        os.replace(tmp_path, json_path)
+    except OSError:
+        pass
+    
+    return config
+
+
+def _load_config(config_path) -> Dict:
+    """Load a pricing config, parsing the YAML only once per file version."""
+    path = Path(config_path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        config = _load_config_file(path, stat)
+        _CONFIG_CACHE[key] = config
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+    else:
+        _CONFIG_CACHE.move_to_end(key)
+    
+    # Callers may mutate their copy; the cached dict must stay pristine
+    return copy.deepcopy(config)
+
+
+@functools.lru_cache(maxsize=1024)
+def _res_key(resolution: str) -> Optional[int]:
+    """
+    Pack a 'WIDTHxHEIGHT' string into one int (width << 16 | height).
+    
+    Returns None for strings that aren't a resolution, which then fall back
+    to the 1.0 multiplier like any unknown resolution.
+    """
+    try:
+        width, height = resolution.lower().split('x')
+        return int(width) << 16 | int(height)
+    except (AttributeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderSpec:
+    """Pricing fields of one provider, pulled out of the config once."""
+    name: str
+    is_local: bool
+    base_cost: float = 0.0
+    steps_cost_per_step: float = 0.0
+    res_mult: Dict[int, float] = field(default_factory=dict)  # keyed by _res_key()
+    model_mult: Dict[str, float] = field(default_factory=dict)
+    gpu_cost_per_hr: float = 0.0
+    avg_time_sec: float = 0.0
+    
+    @classmethod
+    def from_config(cls, provider: str, provider_config: Dict) -> 'ProviderSpec':
+        """Build a spec from a providers: entry of cost_config.yaml."""
+        if provider == 'local':
+            return cls(
+                name=provider_config['name'],
+                is_local=True,
+                gpu_cost_per_hr=provider_config['gpu_cost_per_hr'],
+                avg_time_sec=provider_config['avg_render_time_sec']
+            )
+        
+        return cls(
+            name=provider_config['name'],
+            is_local=False,
+            base_cost=provider_config['base_cost'],
+            steps_cost_per_step=provider_config['steps_cost_per_step'],
+            res_mult={
+                _res_key(res): mult
+                for res, mult in provider_config['resolution_multipliers'].items()
+            },
+            model_mult={
+                key: model.get('cost_multiplier', 1.0)
+                for key, model in provider_config.get('models', {}).items()
+            }
+        )
 
 
 class CostCalculator:
@@ -39,11 +188,18 @@ class CostCalculator:
             # Default to shared/cost_config.yaml
             config_path = Path(__file__).parent / "cost_config.yaml"
         
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = _load_config(config_path)
         
         self.providers = self.config['providers']
         self.limits = self.config['limits']
+        
+        self._specs = {
+            key: ProviderSpec.from_config(key, provider_config)
+            for key, provider_config in self.providers.items()
+        }
+        
+        # Per instance, so a cached quote never outlives the config it came from
+        self._estimate_cached = functools.lru_cache(maxsize=1024)(self._estimate_core)
     
     def estimate_cost(
         self, 
@@ -78,117 +234,152 @@ class CostCalculator:
                 }
             }
         """
-        if provider not in self.providers:
-            raise ValueError(f"Unknown provider: {provider}. Available: {list(self.providers.keys())}")
+        cached = self._estimate_cached(provider, resolution, steps, model, count)
         
-        provider_config = self.providers[provider]
+        # Hand out copies - callers are free to modify the result
+        result = dict(cached)
+        result['breakdown'] = dict(cached['breakdown'])
+        return result
+    
+    def _estimate_core(
+        self,
+        provider: str,
+        resolution: str,
+        steps: int,
+        model: str,
+        count: int
+    ) -> Dict:
+        """Uncached estimate_cost(); memoized per instance in __init__."""
+        spec = self._get_spec(provider)
         
-        if provider == 'local':
+        if spec.is_local:
             # Local GPU rendering - no API cost, only GPU time
-            per_image_cost = self._calculate_local_cost(provider_config)
+            per_image_cost = self._calculate_local_cost(spec)
         else:
             # Cloud API rendering (Stability/DreamStudio)
-            per_image_cost = self._calculate_api_cost(
-                provider_config, 
-                resolution, 
-                steps, 
-                model
-            )
+            per_image_cost = self._calculate_api_cost(spec, resolution, steps, model)
         
         total_cost = per_image_cost * count
         
         # Get breakdown details
-        breakdown = self._get_cost_breakdown(
-            provider, 
-            provider_config, 
-            resolution, 
-            steps, 
-            model
-        )
+        breakdown = self._get_cost_breakdown(spec, resolution, steps, model)
         
         return {
             'total': round(total_cost, 4),
             'per_image': round(per_image_cost, 4),
             'count': count,
             'provider': provider,
-            'provider_name': provider_config['name'],
+            'provider_name': spec.name,
             'breakdown': breakdown
         }
     
-    def _calculate_local_cost(self, provider_config: Dict) -> float:
-        """Calculate cost for local GPU rendering."""
-        gpu_cost_per_hr = provider_config['gpu_cost_per_hr']
-        avg_time_sec = provider_config['avg_render_time_sec']
+    def estimate_costs_batch(
+        self,
+        provider: str,
+        resolutions: Sequence[str],
+        steps: Sequence[int],
+        models: Sequence[str],
+        counts: Sequence[int]
+    ) -> Dict:
+        """
+        Estimate costs for many render configurations at once.
         
-        # Cost = (time_in_hours) * hourly_rate
-        cost_per_image = (avg_time_sec / 3600) * gpu_cost_per_hr
+        Same formula as estimate_cost(), evaluated on NumPy arrays - use this
+        to sweep thousands of (resolution, steps, model, count) combinations
+        without a Python-level loop.
+        
+        Args:
+            provider: Provider name ('local', 'stability', 'dreamstudio')
+            resolutions: Resolution per configuration (e.g., '1024x1024')
+            steps: Diffusion steps per configuration
+            models: Model name per configuration
+            counts: Number of images per configuration
+            
+        Returns:
+            Dictionary of float arrays, one entry per configuration:
+            {
+                'total': np.ndarray,      # Total cost in USD
+                'per_image': np.ndarray   # Cost per image
+            }
+        """
+        spec = self._get_spec(provider)
+        counts_arr = np.asarray(counts, dtype=np.float64)
         
-        return cost_per_image
+        if spec.is_local:
+            per_image = np.full_like(counts_arr, self._calculate_local_cost(spec))
+        else:
+            res_mult = np.fromiter(
+                (spec.res_mult.get(_res_key(r), 1.0) for r in resolutions),
+                dtype=np.float64, count=len(resolutions)
+            )
+            model_mult = np.fromiter(
+                (spec.model_mult.get(m, 1.0) for m in models),
+                dtype=np.float64, count=len(models)
+            )
+            steps_arr = np.asarray(steps, dtype=np.float64)
+            
+            per_image = spec.base_cost * res_mult * model_mult + steps_arr * spec.steps_cost_per_step
+        
+        total = per_image * counts_arr
+        
+        return {
+            'total': np.round(total, 4),
+            'per_image': np.round(per_image, 4)
+        }
+    
+    def _get_spec(self, provider: str) -> ProviderSpec:
+        """Look up a provider's pricing spec, rejecting unknown names."""
+        try:
+            return self._specs[provider]
+        except KeyError:
+            raise ValueError(f"Unknown provider: {provider}. Available: {list(self.providers.keys())}") from None
+    
+    def _calculate_local_cost(self, spec: ProviderSpec) -> float:
+        """Calculate cost for local GPU rendering."""
+        # Cost = (time_in_hours) * hourly_rate
+        return (spec.avg_time_sec / 3600) * spec.gpu_cost_per_hr
     
     def _calculate_api_cost(
         self, 
-        provider_config: Dict, 
+        spec: ProviderSpec, 
         resolution: str, 
         steps: int, 
         model: str
     ) -> float:
         """Calculate cost for cloud API rendering."""
-        # Base cost
-        base_cost = provider_config['base_cost']
-        
-        # Resolution multiplier
-        res_multipliers = provider_config['resolution_multipliers']
-        res_multiplier = res_multipliers.get(resolution, 1.0)
-        
-        # Model multiplier
-        models = provider_config.get('models', {})
-        model_config = models.get(model, {})
-        model_multiplier = model_config.get('cost_multiplier', 1.0)
-        
-        # Steps cost
-        steps_cost_per_step = provider_config['steps_cost_per_step']
-        steps_cost = steps * steps_cost_per_step
+        res_multiplier = spec.res_mult.get(_res_key(resolution), 1.0)
+        model_multiplier = spec.model_mult.get(model, 1.0)
+        steps_cost = steps * spec.steps_cost_per_step
         
         # Total = base * resolution * model + steps
-        total = (base_cost * res_multiplier * model_multiplier) + steps_cost
-        
-        return total
+        return (spec.base_cost * res_multiplier * model_multiplier) + steps_cost
     
     def _get_cost_breakdown(
         self, 
-        provider: str, 
-        provider_config: Dict, 
+        spec: ProviderSpec, 
         resolution: str, 
         steps: int, 
         model: str
     ) -> Dict:
         """Get detailed cost breakdown for display."""
-        if provider == 'local':
-            gpu_cost_per_hr = provider_config['gpu_cost_per_hr']
-            avg_time_sec = provider_config['avg_render_time_sec']
-            
+        if spec.is_local:
             return {
                 'type': 'local',
-                'gpu_cost_per_hr': gpu_cost_per_hr,
-                'avg_render_time_sec': avg_time_sec,
+                'gpu_cost_per_hr': spec.gpu_cost_per_hr,
+                'avg_render_time_sec': spec.avg_time_sec,
                 'api_cost': 0.0
             }
-        else:
-            base = provider_config['base_cost']
-            res_mult = provider_config['resolution_multipliers'].get(resolution, 1.0)
-            model_mult = provider_config['models'].get(model, {}).get('cost_multiplier', 1.0)
-            steps_cost = steps * provider_config['steps_cost_per_step']
-            
-            return {
-                'type': 'api',
-                'base_cost': base,
-                'resolution': resolution,
-                'resolution_multiplier': res_mult,
-                'model': model,
-                'model_multiplier': model_mult,
-                'steps': steps,
-                'steps_cost': steps_cost
-            }
+        
+        return {
+            'type': 'api',
+            'base_cost': spec.base_cost,
+            'resolution': resolution,
+            'resolution_multiplier': spec.res_mult.get(_res_key(resolution), 1.0),
+            'model': model,
+            'model_multiplier': spec.model_mult.get(model, 1.0),
+            'steps': steps,
+            'steps_cost': steps * spec.steps_cost_per_step
+        }
     
     def validate_cost(
         self, 
@@ -264,9 +455,20 @@ class CostCalculator:
         ]
 
 
+@functools.lru_cache(maxsize=4)
+def get_calculator(config_path: Optional[str] = None) -> CostCalculator:
+    """
+    Shared CostCalculator per config path.
+    
+    Preferred over constructing CostCalculator() per request: the instance
+    keeps its estimate cache warm across callers.
+    """
+    return CostCalculator(config_path)
+
+
 if __name__ == '__main__':
     # Quick test
-    calc = CostCalculator()
+    calc = get_calculator()
     
     print("=== Cost Calculator Test ===\n")
     
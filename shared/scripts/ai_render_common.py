@@ -0,0 +1,47 @@
+"""
+AI-Render addon access shared by the Blender generation scripts
+(generate_from_reference.py, generate_character_from_cube.py,
+../test_ai_render.py).
+
+Runs inside Blender; callers put this directory on sys.path first.
+"""
+
+import functools
+import re
+from pathlib import Path
+
+AI_RENDER_CONFIG = Path.home() / ".config/blender/4.0/scripts/addons/AI-Render/config.py"
+
+_API_KEY_RE = re.compile(r'^STABILITY_API_KEY\s*=\s*[\'"]([^\'"]+)[\'"]', re.M)
+
+# AI-Render.operators, imported on first use
+_AI_RENDER_OPS = None
+
+
+@functools.lru_cache(maxsize=4)
+def load_stability_key(config_path=AI_RENDER_CONFIG):
+    """
+    Read STABILITY_API_KEY from AI-Render's config.py (cached per path).
+
+    A plain string assignment is matched with a regex instead of executing
+    the file; anything fancier (env lookups etc.) still gets exec'd.
+    Returns None if the file doesn't define a key.
+    """
+    match = _API_KEY_RE.search(Path(config_path).read_text())
+    if match:
+        return match.group(1)
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("ai_render_config", config_path)
+    config_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config_module)
+    return getattr(config_module, 'STABILITY_API_KEY', None)
+
+
+def get_ai_ops():
+    """Return the AI-Render operators module (imported once)."""
+    global _AI_RENDER_OPS
+    if _AI_RENDER_OPS is None:
+        from importlib import import_module
+        _AI_RENDER_OPS = import_module('AI-Render.operators')
+    return _AI_RENDER_OPS
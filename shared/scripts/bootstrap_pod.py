@@ -14,13 +14,32 @@ Requirements:
     - Local rclone config at ~/.config/rclone/rclone.conf
 """
 
+import configparser
 import json
 import os
 import re
+import threading
 import time
 import subprocess
 from pathlib import Path
 
+# Optional: faster JSONL encode/decode (bytes in, bytes out)
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Optional: wake on file writes instead of polling once a second
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
 ROOT = Path(__file__).resolve().parent.parent.parent
 # Point to the central SSH Agent queue in _tools
 OPS_QUEUE = Path(os.getenv("SSH_AGENT_QUEUE", "${PROJECTS_ROOT}/_tools/ssh_agent/queue"))
@@ -29,37 +48,86 @@ RESULTS = OPS_QUEUE / "results.jsonl"
 POD_ID_FILE = ROOT / ".pod_id"
 RCLONE_CONFIG = Path.home() / ".config/rclone/rclone.conf"
 
+# Fallback parser for configs configparser rejects (e.g. duplicate keys)
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$', re.M)
+_KV_RE = re.compile(r'^\s*(\w+)\s*=\s*(.*?)\s*$', re.M)
+
+
+def _scan_section(config_text: str, name: str):
+    """Regex-scan one section of an INI file into a dict (None if absent)."""
+    headers = list(_SECTION_RE.finditer(config_text))
+    for i, header in enumerate(headers):
+        if header.group(1) == name:
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(config_text)
+            body = config_text[header.end():end]
+            return {key: value for key, value in _KV_RE.findall(body)}
+    return None
+
 
 def get_r2_credentials():
     """Extract R2 credentials from local rclone config."""
     if not RCLONE_CONFIG.exists():
         raise FileNotFoundError(f"rclone config not found at {RCLONE_CONFIG}")
     
-    config_text = RCLONE_CONFIG.read_text()
+    # rclone.conf is INI; no interpolation so '%' in secrets stays literal
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(RCLONE_CONFIG)
+        section = parser['r2_pose_factory'] if parser.has_section('r2_pose_factory') else None
+    except configparser.Error:
+        section = _scan_section(RCLONE_CONFIG.read_text(), 'r2_pose_factory')
+    if section is None:
+        raise ValueError("Missing [r2_pose_factory] section in rclone config")
     
-    # Parse the r2_pose_factory section
-    in_section = False
     creds = {}
-    
-    for line in config_text.split('\n'):
-        if '[r2_pose_factory]' in line:
-            in_section = True
-            continue
-        if in_section:
-            if line.startswith('['):  # New section
-                break
-            if '=' in line:
-                key, value = line.split('=', 1)
-                creds[key.strip()] = value.strip()
-    
-    required = ['access_key_id', 'secret_access_key', 'endpoint']
-    for key in required:
-        if key not in creds:
+    for key in ['access_key_id', 'secret_access_key', 'endpoint']:
+        if key not in section:
             raise ValueError(f"Missing {key} in rclone config")
+        creds[key] = section[key]
     
     return creds
 
 
+def _watch_results(changed: threading.Event):
+    """
+    Set `changed` whenever something in the queue directory is written.
+    
+    Returns the running observer, or None if watchdog isn't installed or
+    the directory can't be watched - callers then fall back to polling.
+    """
+    if Observer is None:
+        return None
+    
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Spurious wakeups (e.g. requests.jsonl) just cost one stat
+            changed.set()
+    
+    observer = Observer()
+    try:
+        observer.schedule(_Handler(), str(RESULTS.parent))
+        observer.start()
+    except OSError:
+        return None
+    return observer
+
+
+def _append_request(line: bytes):
+    """
+    Append one line to the requests queue.
+    
+    O_APPEND makes the single write() land atomically at the end of the
+    file, so other processes appending to the queue stay safe. The file is
+    opened per call so a rotated or recreated queue is always the one
+    written to.
+    """
+    fd = os.open(REQUESTS, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
 def send_command(cmd_id: str, command: str, timeout: int = 300):
     """Send a command to the SSH agent queue and wait for result."""
     request = {
@@ -68,32 +136,62 @@ def send_command(cmd_id: str, command: str, timeout: int = 300):
         "command": command
     }
     
-    # Get current results count
-    results_before = 0
-    if RESULTS.exists():
-        results_before = len(RESULTS.read_text().strip().split('\n'))
+    # Only results appended after this point can be ours
+    results_offset = RESULTS.stat().st_size if RESULTS.exists() else 0
+    partial_line = b""
+    
+    # Start watching before sending so a fast reply can't be missed
+    changed = threading.Event()
+    observer = _watch_results(changed)
     
     # Send command
-    with open(REQUESTS, 'a') as f:
-        f.write(json.dumps(request) + '\n')
+    _append_request(_dumps(request) + b'\n')
     
     print(f"  → Sent: {command[:60]}...")
     
-    # Wait for result
-    start = time.time()
-    while time.time() - start < timeout:
-        if RESULTS.exists():
-            results = RESULTS.read_text().strip().split('\n')
-            if len(results) > results_before:
-                # Find our result
-                for line in results[results_before:]:
+    # Wait for result, reading just the bytes appended since the last check.
+    # One stat per check tells us both whether the file exists and whether
+    # it grew, so idle checks never open it.
+    results_path = str(RESULTS)
+    deadline = time.time() + timeout
+    try:
+        while True:
+            try:
+                size = os.stat(results_path).st_size
+            except FileNotFoundError:
+                size = 0
+            
+            if size > results_offset:
+                with open(results_path, 'rb') as f:
+                    f.seek(results_offset)
+                    new = f.read()
+                results_offset += len(new)
+                
+                # The agent may be mid-write; keep an unterminated line for next check
+                lines = (partial_line + new).split(b'\n')
+                partial_line = lines.pop()
+                for line in lines:
                     try:
-                        result = json.loads(line)
+                        result = _loads(line)
                         if result.get('id') == cmd_id:
                             return result
                     except json.JSONDecodeError:
                         continue
-        time.sleep(1)
+            
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if observer:
+                # Events usually wake us at once; the 1s cap keeps the old
+                # poll as a fallback if inotify misses one (network mounts)
+                changed.wait(min(remaining, 1.0))
+                changed.clear()
+            else:
+                time.sleep(min(1, remaining))
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
     
     return {"error": "timeout", "id": cmd_id}
 
@@ -20,20 +20,38 @@ COST: ~$0.04 per generation (1024x1024, 20 steps, SDXL)
 """
 
 import bpy
+import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Tuple
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ai_render_common import AI_RENDER_CONFIG, get_ai_ops, load_stability_key
 
 # Configuration
-CONFIG = {
-    'prompt': 'A stylized 3D anime character with large expressive eyes, long flowing dark hair, wearing pastel purple outfit with pleated skirt, soft lighting, cherry blossom atmosphere, cute kawaii aesthetic, full body, standing pose, 8k quality, digital art',
-    'negative_prompt': 'photorealistic, realistic, ugly, deformed, bad anatomy, distorted, blurry, low quality, nsfw',
-    'resolution': (1024, 1024),
-    'steps': 20,
-    'cfg_scale': 7.0,
-    'seed': 42,
-    'output_dir': '/workspace/output/',
-    'output_filename': 'character_base.png',
-}
+@dataclass(frozen=True, slots=True)
+class Config:
+    prompt: str
+    negative_prompt: str
+    resolution: Tuple[int, int]
+    steps: int
+    cfg_scale: float
+    seed: int
+    output_dir: str
+    output_filename: str
+
+CFG = Config(
+    prompt='A stylized 3D anime character with large expressive eyes, long flowing dark hair, wearing pastel purple outfit with pleated skirt, soft lighting, cherry blossom atmosphere, cute kawaii aesthetic, full body, standing pose, 8k quality, digital art',
+    negative_prompt='photorealistic, realistic, ugly, deformed, bad anatomy, distorted, blurry, low quality, nsfw',
+    resolution=(1024, 1024),
+    steps=20,
+    cfg_scale=7.0,
+    seed=42,
+    output_dir='/workspace/output/',
+    output_filename='character_base.png',
+)
 
 def setup_scene():
     """Create a simple scene: cube, camera, light."""
@@ -41,9 +59,9 @@ def setup_scene():
     print("🎬 Setting up Blender scene...")
     print("="*60)
     
-    # Clear default scene
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+    # Clear default scene (data API - skips operator poll/undo overhead)
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
     
     # Add cube (our character placeholder)
     bpy.ops.mesh.primitive_cube_add(location=(0, 0, 1))
@@ -63,9 +81,11 @@ def setup_scene():
     bpy.context.scene.camera = camera
     
     # Add light
-    bpy.ops.object.light_add(type='SUN', location=(2, 2, 5))
-    light = bpy.context.active_object
-    light.data.energy = 2.0
+    light_data = bpy.data.lights.new(name="Sun", type='SUN')
+    light_data.energy = 2.0
+    light = bpy.data.objects.new("Sun", light_data)
+    bpy.context.scene.collection.objects.link(light)
+    light.location = (2, 2, 5)
     
     print(f"✅ Scene ready: {cube.name}, {camera.name}, {light.name}")
 
@@ -76,17 +96,17 @@ def configure_render_settings():
     print("="*60)
     
     scene = bpy.context.scene
-    scene.render.resolution_x = CONFIG['resolution'][0]
-    scene.render.resolution_y = CONFIG['resolution'][1]
+    scene.render.resolution_x = CFG.resolution[0]
+    scene.render.resolution_y = CFG.resolution[1]
     scene.render.resolution_percentage = 100
     
     # Set output path
-    output_path = Path(CONFIG['output_dir']) / CONFIG['output_filename']
+    output_path = Path(CFG.output_dir) / CFG.output_filename
     scene.render.filepath = str(output_path)
     scene.render.image_settings.file_format = 'PNG'
     scene.render.image_settings.color_mode = 'RGBA'
     
-    print(f"✅ Resolution: {CONFIG['resolution'][0]}x{CONFIG['resolution'][1]}")
+    print(f"✅ Resolution: {CFG.resolution[0]}x{CFG.resolution[1]}")
     print(f"✅ Output: {scene.render.filepath}")
 
 def configure_ai_render():
@@ -106,15 +126,12 @@ def configure_ai_render():
     prefs.sd_backend = 'dreamstudio'  # Uses Stability API
     
     # Load API key from config
-    config_path = Path.home() / ".config/blender/4.0/scripts/addons/AI-Render/config.py"
+    config_path = AI_RENDER_CONFIG
     if config_path.exists():
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("ai_render_config", config_path)
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
+        api_key = load_stability_key(config_path)
         
-        if hasattr(config_module, 'STABILITY_API_KEY'):
-            prefs.dream_studio_api_key = config_module.STABILITY_API_KEY
+        if api_key:
+            prefs.dream_studio_api_key = api_key
             print(f"✅ API key loaded")
         else:
             print(f"⚠️  No API key found in config")
@@ -127,20 +144,20 @@ def configure_ai_render():
     scene = bpy.context.scene
     scene.air_props.is_enabled = True
     scene.air_props.auto_run = True
-    scene.air_props.prompt_text = CONFIG['prompt']
-    scene.air_props.negative_prompt_text = CONFIG['negative_prompt']
-    scene.air_props.steps = CONFIG['steps']
-    scene.air_props.cfg_scale = CONFIG['cfg_scale']
+    scene.air_props.prompt_text = CFG.prompt
+    scene.air_props.negative_prompt_text = CFG.negative_prompt
+    scene.air_props.steps = CFG.steps
+    scene.air_props.cfg_scale = CFG.cfg_scale
     scene.air_props.image_similarity = 0.0  # Pure text-to-image
     scene.air_props.use_random_seed = False
-    scene.air_props.seed = CONFIG['seed']
+    scene.air_props.seed = CFG.seed
     
     # CRITICAL: Enable autosave (required for headless mode)
     scene.air_props.do_autosave_after_images = True
-    scene.air_props.autosave_image_path = CONFIG['output_dir']
+    scene.air_props.autosave_image_path = CFG.output_dir
     
-    print(f"✅ Prompt: {CONFIG['prompt'][:60]}...")
-    print(f"✅ Steps: {CONFIG['steps']}, CFG: {CONFIG['cfg_scale']}")
+    print(f"✅ Prompt: {CFG.prompt[:60]}...")
+    print(f"✅ Steps: {CFG.steps}, CFG: {CFG.cfg_scale}")
     print(f"✅ Autosave: {scene.air_props.autosave_image_path}")
     
     return True
@@ -187,8 +204,7 @@ def generate_ai_character():
         print(f"   ✅ Loaded and updated Render Result")
     
     # Import and call AI Render
-    from importlib import import_module
-    operators_module = import_module('AI-Render.operators')
+    operators_module = get_ai_ops()
     
     # Pre-API setup
     operators_module.do_pre_api_setup(scene)
@@ -200,15 +216,14 @@ def generate_ai_character():
             print("\n   ✅ AI generation complete!")
             
             # Find the generated image
-            output_dir = Path(CONFIG['output_dir'])
-            ai_images = sorted(
+            output_dir = Path(CFG.output_dir)
+            newest = max(
                 output_dir.glob("ai-render-*-2-after.png"),
                 key=lambda p: p.stat().st_mtime,
-                reverse=True
+                default=None
             )
             
-            if ai_images:
-                newest = ai_images[0]
+            if newest:
                 size_mb = newest.stat().st_size / (1024 * 1024)
                 print(f"   📁 AI-generated image: {newest.name}")
                 print(f"      Size: {size_mb:.2f} MB")
@@ -235,7 +250,7 @@ def main():
     print("="*60)
     
     # Ensure output directory exists
-    Path(CONFIG['output_dir']).mkdir(parents=True, exist_ok=True)
+    Path(CFG.output_dir).mkdir(parents=True, exist_ok=True)
     
     # Step 1: Setup
     setup_scene()
@@ -260,7 +275,7 @@ def main():
     print("\n" + "="*60)
     print("🎉 PIPELINE COMPLETE!")
     print("="*60)
-    print(f"📂 Check outputs in: {CONFIG['output_dir']}")
+    print(f"📂 Check outputs in: {CFG.output_dir}")
     print("="*60)
 
 if __name__ == "__main__":
@@ -15,9 +15,15 @@ COST: ~$0.04 per generation (1024x1024, 20 steps, SDXL)
 """
 
 import bpy
+import os
+import struct
 import sys
 from pathlib import Path
 
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ai_render_common import AI_RENDER_CONFIG, get_ai_ops, load_stability_key
+
 # Configuration
 CONFIG = {
     'reference_image': '/workspace/reference.png',  # Your reference image
@@ -71,15 +77,12 @@ def configure_ai_render():
     prefs.sd_backend = 'dreamstudio'  # Uses Stability API
     
     # Load API key from config
-    config_path = Path.home() / ".config/blender/4.0/scripts/addons/AI-Render/config.py"
+    config_path = AI_RENDER_CONFIG
     if config_path.exists():
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("ai_render_config", config_path)
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
+        api_key = load_stability_key(config_path)
         
-        if hasattr(config_module, 'STABILITY_API_KEY'):
-            prefs.dream_studio_api_key = config_module.STABILITY_API_KEY
+        if api_key:
+            prefs.dream_studio_api_key = api_key
             print(f"✅ API key loaded")
         else:
             print(f"⚠️  No API key found in config")
@@ -117,6 +120,66 @@ def configure_ai_render():
     
     return True
 
+def _image_size(path):
+    """
+    (width, height) from the image header without decoding pixels.
+    
+    Uses Pillow when Blender's Python has it, otherwise reads a PNG's IHDR
+    chunk directly. Returns None if neither works.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        pass
+    else:
+        with Image.open(path) as im:
+            return im.size
+    
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+def _resize_reference(ref_path, size, out_path):
+    """
+    Resize the reference to size x size with OpenCV and save it as a PNG.
+    
+    Headless AI-Render needs a file-backed Render Result (see
+    test_ai_render.py), so the result goes to disk for Blender to load
+    rather than into a generated image. Returns out_path, or None when no
+    resize is needed or OpenCV isn't available in Blender's Python - the
+    caller then loads the original and falls back to Blender's image.scale().
+    """
+    # Header-only check first so an already-sized reference is decoded once,
+    # by Blender, rather than once here and again on load
+    if _image_size(ref_path) == (size, size):
+        return None
+    
+    try:
+        import cv2
+    except ImportError:
+        return None
+    
+    im = cv2.imread(ref_path, cv2.IMREAD_UNCHANGED)
+    if im is None:
+        return None
+    
+    height, width = im.shape[:2]
+    print(f"   Original size: {width}x{height}")
+    if (width, height) == (size, size):
+        return None
+    
+    print(f"   Resizing to {size}x{size} (OpenCV)...")
+    # INTER_AREA averages properly when shrinking; cubic is better for growing
+    interpolation = cv2.INTER_AREA if width > size or height > size else cv2.INTER_CUBIC
+    im = cv2.resize(im, (size, size), interpolation=interpolation)
+    
+    # Fastest zlib level: the file is read back once, straight away
+    if not cv2.imwrite(str(out_path), im, [cv2.IMWRITE_PNG_COMPRESSION, 1]):
+        return None
+    return out_path
+
 def load_reference_as_render_result():
     """Load the reference image into Blender as 'Render Result' and resize to 1024x1024."""
     print("\n" + "="*60)
@@ -125,19 +188,21 @@ def load_reference_as_render_result():
     
     ref_path = CONFIG['reference_image']
     
-    # Load the reference image
-    ref_img = bpy.data.images.load(ref_path)
-    ref_img.update()
+    # Resize to 1024x1024 (SDXL requirement) before Blender sees the image
+    resized_path = Path(CONFIG['output_dir']) / 'reference_1024.png'
+    resized = _resize_reference(ref_path, 1024, resized_path)
     
-    print(f"   Original size: {ref_img.size[0]}x{ref_img.size[1]}")
+    # Load the reference image; any previous Render Result stays in place
+    # until this succeeds
+    ref_img = bpy.data.images.load(str(resized or ref_path))
     
-    # Resize to 1024x1024 (SDXL requirement)
+    # Already 1024x1024, or no OpenCV - fall back to Blender's resampler
     if ref_img.size[0] != 1024 or ref_img.size[1] != 1024:
+        print(f"   Original size: {ref_img.size[0]}x{ref_img.size[1]}")
         print(f"   Resizing to 1024x1024...")
         ref_img.scale(1024, 1024)
         ref_img.update()
     
-    # Remove existing Render Result if present
     if 'Render Result' in bpy.data.images:
         bpy.data.images.remove(bpy.data.images['Render Result'])
     
@@ -162,8 +227,7 @@ def generate_ai_character():
     scene = bpy.context.scene
     
     # Import and call AI Render
-    from importlib import import_module
-    operators_module = import_module('AI-Render.operators')
+    operators_module = get_ai_ops()
     
     # Pre-API setup
     operators_module.do_pre_api_setup(scene)
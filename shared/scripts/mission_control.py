@@ -17,37 +17,167 @@ Note: No venv needed - uses system Python
 """
 
 import argparse
+import atexit
+import base64
+import hashlib
 import json
+import os
+import re
+import secrets
+import socket
 import subprocess
 import sys
+import tarfile
+import tempfile
 import time
-from datetime import datetime
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-import uuid
+
+# Manifests are only machine-read (jq on the pod), so skip pretty-printing
+try:
+    import orjson
+    def _dump_manifest(manifest):
+        return orjson.dumps(manifest)
+except ImportError:
+    def _dump_manifest(manifest):
+        return json.dumps(manifest, separators=(',', ':')).encode()
 
 # Import shared utilities
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils import DEFAULT_JOB_TIMEOUT
+from utils import CONSTANTS
 
 # Configuration
 R2_REMOTE = "r2_pose_factory:pose-factory"
 JOBS_PATH = "jobs"
 RESULTS_PATH = "results"
 SCRIPTS_PATH = "shared/scripts"
+# Many small files: overlap per-object round trips instead of 4 at a time
+DIR_TRANSFER_FLAGS = ["--transfers", "32", "--checkers", "32", "--fast-list"]
+# Large result blobs: fetch byte ranges of one file in parallel
+DOWNLOAD_STREAM_FLAGS = ["--multi-thread-streams", "4", "--multi-thread-cutoff", "16M"]
+SNAPSHOT_TTL = 2  # seconds a job-location snapshot may be reused
+UPLOAD_TIMEOUT = 120  # seconds before a single-file upload counts as failed
+# create_job's IDs embed their creation time: <type>_<epoch ms>_<hex>
+# (IDs from before the switch use <type>_YYYYMMDD_HHMMSS_<hex>)
+JOB_ID_TIME_RE = re.compile(r'_(?:(\d{13})|(\d{8}_\d{6}))_[0-9a-f]{8}$')
+
+def _job_sort_key(manifest_file):
+    """Creation time in ms for a manifest, from its name when possible"""
+    match = JOB_ID_TIME_RE.search(manifest_file.stem)
+    if match and match.group(1):
+        return int(match.group(1))
+    return int(manifest_file.stat().st_mtime * 1000)
 
 class MissionControl:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent.parent
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        self._rc_url = None
+        self._rc_auth = None
+        self._rc_ok = None  # None = daemon not tried yet
+        # Completion is permanent, so jobs seen completed never hit R2 again
+        self._status_cache_file = self.project_root / "data" / ".status_cache.json"
+        self._completed = None
         
-    def run_rclone(self, args, check=True):
+    def run_rclone(self, args, check=True, timeout=None):
         """Run rclone command and return result"""
         cmd = ["rclone"] + args
-        result = subprocess.run(cmd, capture_output=True, text=True, check=check)
+        result = subprocess.run(cmd, capture_output=True, text=True, check=check, timeout=timeout)
         return result
     
+    def _start_rc_daemon(self):
+        """
+        Start a private `rclone rcd` for this process's lifetime.
+        
+        Listings then cost one local HTTP request instead of spawning rclone
+        every poll. Binds a free localhost port with random credentials so
+        no other process can drive our R2 remote through it.
+        """
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        user, password = "mission_control", secrets.token_hex(16)
+        
+        try:
+            # Credentials go through the environment, not argv, so they
+            # don't show up in ps / /proc/<pid>/cmdline
+            proc = subprocess.Popen(
+                ["rclone", "rcd", f"--rc-addr=127.0.0.1:{port}"],
+                env={**os.environ, "RCLONE_RC_USER": user, "RCLONE_RC_PASS": password},
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            return False
+        atexit.register(proc.terminate)
+        
+        deadline = time.time() + 5
+        while time.time() < deadline and proc.poll() is None:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            except OSError:
+                time.sleep(0.1)
+                continue
+            self._rc_url = f"http://127.0.0.1:{port}"
+            self._rc_auth = "Basic " + base64.b64encode(f"{user}:{password}".encode()).decode()
+            return True
+        
+        proc.terminate()
+        return False
+    
+    def _rc(self, method, **params):
+        """Call the rc daemon; raises urllib.error.URLError on failure"""
+        request = urllib.request.Request(
+            f"{self._rc_url}/{method}",
+            data=json.dumps(params).encode(),
+            headers={"Content-Type": "application/json", "Authorization": self._rc_auth}
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return json.load(response)
+    
+    def _rc_available(self):
+        """Start the rc daemon on first use; False if it can't run"""
+        if self._rc_ok is None:
+            self._rc_ok = self._start_rc_daemon()
+        return self._rc_ok
+    
+    def _list_r2(self, r2_path, recursive=False, dirs_only=False, files_only=False):
+        """
+        List an R2 path like `rclone lsjson` (entries with Path/Name/IsDir).
+        
+        Goes through the rc daemon when it can be started, falling back to
+        the rclone CLI. Returns None if the path can't be listed.
+        """
+        if self._rc_available():
+            opt = {"recurse": recursive, "dirsOnly": dirs_only, "filesOnly": files_only,
+                   "noModTime": True, "noMimeType": True}
+            try:
+                return self._rc("operations/list", fs=f"{R2_REMOTE}/{r2_path}", remote="", opt=opt)["list"]
+            except urllib.error.HTTPError:
+                return None  # daemon answered - the path is missing or unreadable
+            except (urllib.error.URLError, OSError):
+                self._rc_ok = False  # daemon died - use the CLI from now on
+        
+        args = ["lsjson", "--no-modtime", "--no-mimetype"]
+        if recursive:
+            args.append("--recursive")
+        if dirs_only:
+            args.append("--dirs-only")
+        if files_only:
+            args.append("--files-only")
+        result = self.run_rclone(args + [f"{R2_REMOTE}/{r2_path}"], check=False)
+        if result.returncode == 0 and result.stdout.strip():
+            return json.loads(result.stdout)
+        return None
+    
     def upload_to_r2(self, local_path, r2_path, show_progress=True):
         """Upload file or directory to R2"""
         args = ["copy", str(local_path), f"{R2_REMOTE}/{r2_path}"]
+        if Path(local_path).is_dir():
+            args += DIR_TRANSFER_FLAGS
         if show_progress:
             args.append("--progress")
         
@@ -57,9 +187,31 @@ class MissionControl:
             print(f"✅ Upload complete")
         return result.returncode == 0
     
+    def upload_file(self, local_file, r2_path):
+        """
+        Upload one file to an exact object path (copyto, not copy).
+        
+        Gives up after UPLOAD_TIMEOUT seconds so a stuck transfer can't hang
+        the caller. Returns False if the file didn't reach R2.
+        """
+        print(f"📤 Uploading {local_file} → R2/{r2_path}")
+        try:
+            result = self.run_rclone(["copyto", str(local_file), f"{R2_REMOTE}/{r2_path}"],
+                                     check=False, timeout=UPLOAD_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            print(f"❌ Upload timed out after {UPLOAD_TIMEOUT}s")
+            return False
+        if result.returncode == 0:
+            print(f"✅ Upload complete")
+        else:
+            print(f"❌ Upload failed: {result.stderr.strip()}")
+        return result.returncode == 0
+    
     def download_from_r2(self, r2_path, local_path, show_progress=True):
         """Download file or directory from R2"""
-        args = ["copy", f"{R2_REMOTE}/{r2_path}", str(local_path)]
+        args = ["copy", f"{R2_REMOTE}/{r2_path}", str(local_path)] + DOWNLOAD_STREAM_FLAGS
+        if r2_path.endswith("/"):
+            args += DIR_TRANSFER_FLAGS
         if show_progress:
             args.append("--progress")
         
@@ -69,14 +221,81 @@ class MissionControl:
             print(f"✅ Download complete: {local_path}")
         return result.returncode == 0
     
+    def download_results(self, job_id, output_dir):
+        """
+        Download a job's results, preferring the pod's single-object bundle.
+        
+        One bundle.tar is a single R2 request instead of one per rendered
+        image; jobs without a bundle (older pod agents, a failed tar step)
+        fall back to copying the directory.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundle_file = Path(tmp_dir) / "bundle.tar"
+            try:
+                self.download_from_r2(f"{RESULTS_PATH}/{job_id}/bundle.tar", tmp_dir, show_progress=False)
+            except subprocess.CalledProcessError:
+                pass  # rclone exits non-zero when the bundle doesn't exist
+            if bundle_file.is_file():
+                output_dir = Path(output_dir)
+                output_dir.mkdir(parents=True, exist_ok=True)
+                with tarfile.open(bundle_file) as bundle:
+                    if hasattr(tarfile, "data_filter"):
+                        bundle.extractall(output_dir, filter="data")
+                    else:
+                        bundle.extractall(output_dir)
+                print(f"✅ Extracted bundle to: {output_dir}")
+                return True
+        
+        print("   No bundle.tar - downloading files individually")
+        return self.download_from_r2(f"{RESULTS_PATH}/{job_id}/", output_dir)
+    
+    def upload_scripts_if_changed(self, local_dir, r2_path, force=False):
+        """
+        Upload a scripts directory unless R2 already has exactly these files.
+        
+        The fingerprint is a hash of every file's relative path and contents,
+        stored next to the scripts in R2 as <r2_path>/.fingerprint - so an
+        upload from another machine, or a hand edit in R2, is noticed, and a
+        touch or fresh checkout alone doesn't cause a re-upload.
+        """
+        digest = hashlib.sha256()
+        for path in sorted(local_dir.rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts and path.name != ".fingerprint":
+                digest.update(f"{path.relative_to(local_dir)}\0".encode())
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+        fingerprint = digest.hexdigest()
+        
+        fingerprint_path = f"{r2_path}/.fingerprint"
+        remote = self.run_rclone(["cat", f"{R2_REMOTE}/{fingerprint_path}"], check=False)
+        if not force and remote.returncode == 0 and remote.stdout.strip() == fingerprint:
+            print(f"⏭️  {r2_path} already up to date in R2 - skipping")
+            return True
+        
+        if not self.upload_to_r2(local_dir, r2_path, show_progress=False):
+            return False
+        # Written last, so an interrupted upload is retried next time
+        with tempfile.NamedTemporaryFile("w", suffix=".fingerprint") as f:
+            f.write(fingerprint)
+            f.flush()
+            self.run_rclone(["copyto", f.name, f"{R2_REMOTE}/{fingerprint_path}"], check=False)
+        return True
+    
     def create_job(self, job_type, params):
-        """Create a job manifest and upload to R2"""
-        job_id = f"{job_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        """
+        Create a job manifest and upload it to R2.
+        
+        Returns (job_id, manifest_file), or (None, None) if the manifest
+        couldn't be uploaded - the pod would never see that job, so the
+        local copy is removed too.
+        """
+        ts_ms = time.time_ns() // 1_000_000
+        job_id = f"{job_type}_{ts_ms:013d}_{secrets.token_hex(4)}"
         
         manifest = {
             "job_id": job_id,
             "job_type": job_type,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": datetime.fromtimestamp(ts_ms / 1000, timezone.utc).isoformat(),
+            "created_ts_ms": ts_ms,
             "status": "pending",
             "params": params
         }
@@ -86,54 +305,107 @@ class MissionControl:
         manifest_dir.mkdir(parents=True, exist_ok=True)
         manifest_file = manifest_dir / f"{job_id}.json"
         
-        with open(manifest_file, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file.write_bytes(_dump_manifest(manifest))
         
         print(f"📋 Created job: {job_id}")
         
         # Upload to R2
-        self.upload_to_r2(manifest_file, f"{JOBS_PATH}/pending/{job_id}.json", show_progress=False)
+        if not self.upload_file(manifest_file, f"{JOBS_PATH}/pending/{job_id}.json"):
+            manifest_file.unlink()
+            return None, None
         
         return job_id, manifest_file
     
-    def check_job_status(self, job_id):
-        """Check if job has completed by looking for result in R2"""
-        # Check if result exists
-        result = self.run_rclone([
-            "lsf", 
-            f"{R2_REMOTE}/{RESULTS_PATH}/{job_id}/"
-        ], check=False)
+    def _snapshot_jobs(self):
+        """
+        List where every job currently is, in two R2 listings total.
         
-        if result.returncode == 0 and result.stdout.strip():
-            return "completed"
+        Returns {'completed': set, 'pending': set, 'processing': set} of
+        job IDs. Reused for SNAPSHOT_TTL seconds so back-to-back status
+        checks don't list R2 again.
+        """
+        if self._snapshot is not None and time.time() - self._snapshot_time < SNAPSHOT_TTL:
+            return self._snapshot
         
-        # Check if job is still pending
-        result = self.run_rclone([
-            "lsf",
-            f"{R2_REMOTE}/{JOBS_PATH}/pending/{job_id}.json"
-        ], check=False)
+        snapshot = {"completed": set(), "pending": set(), "processing": set()}
         
-        if result.returncode == 0 and result.stdout.strip():
-            return "pending"
+        # Settle daemon-vs-CLI before fanning out, so the two listings
+        # don't both try to start a daemon
+        self._rc_available()
         
-        # Check if job is processing
-        result = self.run_rclone([
-            "lsf",
-            f"{R2_REMOTE}/{JOBS_PATH}/processing/{job_id}.json"
-        ], check=False)
+        # The two listings are independent R2 round trips - run them together
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            # A job counts as completed once its results "directory" has objects
+            results_listing = pool.submit(self._list_r2, RESULTS_PATH, dirs_only=True)
+            # jobs/pending/<id>.json and jobs/processing/<id>.json
+            jobs_listing = pool.submit(self._list_r2, JOBS_PATH, recursive=True, files_only=True)
         
-        if result.returncode == 0 and result.stdout.strip():
-            return "processing"
+        entries = results_listing.result()
+        if entries:
+            snapshot["completed"] = {entry["Name"] for entry in entries}
+        
+        entries = jobs_listing.result()
+        if entries:
+            for entry in entries:
+                state, _, name = entry["Path"].partition("/")
+                if state in snapshot and name.endswith(".json"):
+                    snapshot[state].add(name[:-len(".json")])
+        
+        self._snapshot = snapshot
+        self._snapshot_time = time.time()
+        return snapshot
+    
+    def _completed_jobs(self):
+        """Job IDs already seen completed (data/.status_cache.json)"""
+        if self._completed is None:
+            try:
+                self._completed = set(json.loads(self._status_cache_file.read_text()))
+            except (OSError, ValueError):
+                self._completed = set()
+        return self._completed
+    
+    def _remember_completed(self, job_id):
+        """Add a job to the completed cache, replacing the file atomically"""
+        completed = self._completed_jobs()
+        completed.add(job_id)
+        self._status_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._status_cache_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(sorted(completed)))
+        os.replace(tmp_file, self._status_cache_file)
+    
+    def check_job_status(self, job_id, snapshot=None, refresh=False):
+        """
+        Check if job has completed by looking for result in R2
+        
+        Pass a snapshot from _snapshot_jobs() to check many jobs against a
+        single listing. Jobs already seen completed are answered from the
+        local cache unless refresh is set.
+        """
+        if not refresh and job_id in self._completed_jobs():
+            return "completed"
+        
+        if snapshot is None:
+            snapshot = self._snapshot_jobs()
+        
+        for status in ("completed", "pending", "processing"):
+            if job_id in snapshot[status]:
+                if status == "completed":
+                    self._remember_completed(job_id)
+                return status
         
         return "unknown"
     
-    def wait_for_job(self, job_id, timeout=DEFAULT_JOB_TIMEOUT):
+    def wait_for_job(self, job_id, timeout=CONSTANTS.DEFAULT_JOB_TIMEOUT):
         """Wait for job to complete, showing progress"""
         print(f"⏳ Waiting for job {job_id} to complete...")
         print(f"   (Pod agent polls every 30 seconds)")
         
         start_time = time.time()
         last_status = None
+        last_heartbeat = start_time
+        # Poll quickly at first so short jobs return fast, then back off to
+        # the pod agent's own 30s cadence
+        delay = 2
         
         while time.time() - start_time < timeout:
             status = self.check_job_status(job_id)
@@ -145,13 +417,18 @@ class MissionControl:
                     print(f"✅ Job completed!")
                     return True
                 last_status = status
+                delay = 2
             
             if status == "completed":
                 return True
             
+            time.sleep(delay)
+            delay = min(30, delay * 1.5)
+            
             # Show a heartbeat every 30 seconds
-            time.sleep(30)
-            print(f"   ... still waiting ({int(time.time() - start_time)}s elapsed)")
+            if time.time() - last_heartbeat >= 30:
+                last_heartbeat = time.time()
+                print(f"   ... still waiting ({int(time.time() - start_time)}s elapsed)")
         
         print(f"⚠️  Timeout waiting for job after {timeout}s")
         return False
@@ -167,21 +444,26 @@ class MissionControl:
         
         # Upload necessary scripts
         print("📦 Preparing render job...")
-        self.upload_to_r2(
+        self.upload_scripts_if_changed(
             self.project_root / "pose-rendering" / "scripts",
             "pose-rendering/scripts",
-            show_progress=False
+            force=args.force_upload
         )
         
         # Create job
         job_id, manifest_file = self.create_job("render", params)
         
+        # The pod only sees the job once its manifest is in R2
+        if job_id is None:
+            print(f"❌ Job was not submitted: its manifest never reached R2")
+            return False
+        
         # Wait for completion
         if args.wait:
             if self.wait_for_job(job_id):
                 # Download results
                 output_dir = self.project_root / "data" / "working" / args.output.replace("output/", "")
-                self.download_from_r2(f"{RESULTS_PATH}/{job_id}/", output_dir)
+                self.download_results(job_id, output_dir)
             else:
                 print(f"💡 Job may still be running. Check status with: ./mission_control.py status --job {job_id}")
         else:
@@ -208,19 +490,34 @@ class MissionControl:
     def cmd_status(self, args):
         """Check job status"""
         if args.job:
-            status = self.check_job_status(args.job)
+            status = self.check_job_status(args.job, refresh=args.refresh)
             print(f"Job {args.job}: {status}")
         else:
             # List all recent jobs
             manifest_dir = self.project_root / "data" / "jobs"
             if manifest_dir.exists():
-                manifests = sorted(manifest_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+                manifests = sorted(manifest_dir.glob("*.json"), key=_job_sort_key, reverse=True)[:10]
+                # Only list R2 if some job's status isn't settled locally
+                completed = self._completed_jobs()
+                if args.refresh or any(m.stem not in completed for m in manifests):
+                    snapshot = self._snapshot_jobs()
+                else:
+                    snapshot = None
                 print(f"📋 Recent jobs (last 10):\n")
-                for manifest_file in manifests[:10]:
-                    with open(manifest_file) as f:
-                        manifest = json.load(f)
-                    status = self.check_job_status(manifest['job_id'])
-                    print(f"   {manifest['job_id']}: {status} ({manifest['created_at']})")
+                for manifest_file in manifests:
+                    # Manifests are saved as <job_id>.json, so the ID and
+                    # creation time come from the name without opening it
+                    job_id = manifest_file.stem
+                    match = JOB_ID_TIME_RE.search(job_id)
+                    if match and match.group(1):
+                        created_at = datetime.fromtimestamp(int(match.group(1)) / 1000, timezone.utc).isoformat()
+                    elif match:
+                        created_at = datetime.strptime(match.group(2), '%Y%m%d_%H%M%S').isoformat()
+                    else:
+                        with open(manifest_file) as f:
+                            created_at = json.load(f)['created_at']
+                    status = self.check_job_status(job_id, snapshot, refresh=args.refresh)
+                    print(f"   {job_id}: {status} ({created_at})")
     
     def cmd_download(self, args):
         """Download job results"""
@@ -236,7 +533,7 @@ class MissionControl:
         
         # Download results
         output_dir = self.project_root / "data" / "working" / job_id
-        self.download_from_r2(f"{RESULTS_PATH}/{job_id}/", output_dir)
+        self.download_results(job_id, output_dir)
 
 def main():
     parser = argparse.ArgumentParser(description="Mission Control - RunPod orchestrator")
@@ -247,6 +544,7 @@ def main():
     render_parser.add_argument('--characters', help='Comma-separated character names')
     render_parser.add_argument('--output', default='output/simple_multi_angle', help='Output directory')
     render_parser.add_argument('--wait', action='store_true', help='Wait for completion and auto-download')
+    render_parser.add_argument('--force-upload', action='store_true', help='Re-upload render scripts even if unchanged')
     
     # Setup pod command
     setup_parser = subparsers.add_parser('setup-pod', help='Upload setup scripts to R2')
@@ -254,6 +552,7 @@ def main():
     # Status command
     status_parser = subparsers.add_parser('status', help='Check job status')
     status_parser.add_argument('--job', help='Specific job ID')
+    status_parser.add_argument('--refresh', action='store_true', help='Re-check R2 even for jobs cached as completed')
     
     # Download command
     download_parser = subparsers.add_parser('download', help='Download job results')
@@ -269,7 +568,8 @@ def main():
     mc = MissionControl()
     
     if args.command == 'render':
-        mc.cmd_render(args)
+        if mc.cmd_render(args) is False:
+            sys.exit(1)
     elif args.command == 'setup-pod':
         mc.cmd_setup_pod(args)
     elif args.command == 'status':
@@ -80,6 +80,20 @@ move_to_processing() {
     rclone move "$R2_REMOTE/$JOBS_PENDING/$job_file" "$R2_REMOTE/$JOBS_PROCESSING/" 2>/dev/null || true
 }
 
+# Upload a job's output directory to R2
+# bundle.tar goes first (one object for clients to fetch), then the loose
+# files for anything that browses results directly.
+upload_results() {
+    local source_dir="$1"
+    local job_id="$2"
+    local bundle="$WORKSPACE/jobs/$job_id.bundle.tar"
+    
+    tar -cf "$bundle" -C "$source_dir" .
+    rclone copyto "$bundle" "$R2_REMOTE/$RESULTS/$job_id/bundle.tar"
+    rm -f "$bundle"
+    rclone copy "$source_dir/" "$R2_REMOTE/$RESULTS/$job_id/" --progress
+}
+
 # Execute render job
 execute_render_job() {
     local manifest_file="$1"
@@ -119,7 +133,7 @@ execute_render_job() {
     # Upload results
     log "Uploading results to R2..."
     if [ -d "$WORKSPACE/$output_dir" ]; then
-        rclone copy "$WORKSPACE/$output_dir/" "$R2_REMOTE/$RESULTS/$job_id/" --progress
+        upload_results "$WORKSPACE/$output_dir" "$job_id"
         log_success "Results uploaded to R2/$RESULTS/$job_id/"
     else
         log_error "Output directory not found: $WORKSPACE/$output_dir"
@@ -150,7 +164,7 @@ execute_character_job() {
     
     # Upload results
     log "Uploading results to R2..."
-    rclone copy "$WORKSPACE/output/$job_id/" "$R2_REMOTE/$RESULTS/$job_id/" --progress
+    upload_results "$WORKSPACE/output/$job_id" "$job_id"
     log_success "Results uploaded"
 }
 
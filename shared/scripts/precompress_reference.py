@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Losslessly shrink a reference image before it goes to R2.
+
+generate_from_reference.py downloads reference/reference.png on every run.
+Most PNGs are saved at zlib level 6; re-encoding at level 9 with Pillow's
+optimizer gives the same pixels in fewer bytes, so every pod download moves
+less data. Run once per new reference.
+
+Usage:
+    python precompress_reference.py reference.png
+    python precompress_reference.py reference.png --upload
+
+Requirements:
+    - Pillow (see requirements.txt)
+    - Local rclone config with r2_pose_factory (for --upload)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+R2_REFERENCE = "r2_pose_factory:pose-factory/reference/"
+
+
+def _png_metadata(im: Image.Image) -> dict:
+    """
+    Save arguments that carry a PNG's colour and text chunks over.
+
+    Pillow re-encodes pixels only; without these, iCCP/gAMA/cHRM/sRGB (how
+    Blender colour-manages the reference) and tEXt/zTXt/iTXt would be
+    dropped.
+    """
+    pnginfo = PngInfo()
+    if "gamma" in im.info:
+        pnginfo.add(b"gAMA", round(im.info["gamma"] * 100000).to_bytes(4, "big"))
+    if "chromaticity" in im.info:
+        pnginfo.add(b"cHRM", b"".join(round(v * 100000).to_bytes(4, "big")
+                                      for v in im.info["chromaticity"]))
+    if "srgb" in im.info:
+        pnginfo.add(b"sRGB", bytes([im.info["srgb"]]))
+    for key, value in im.text.items():
+        pnginfo.add_text(key, value)
+
+    metadata = {"pnginfo": pnginfo}
+    for key in ("icc_profile", "dpi", "exif", "transparency"):
+        if key in im.info:
+            metadata[key] = im.info[key]
+    return metadata
+
+
+def precompress(path: Path) -> int:
+    """
+    Re-encode a PNG at maximum compression, in place.
+
+    Pixels, colour chunks and text are kept. Returns bytes saved (0 if the
+    re-encode wasn't smaller and the original was kept). Raises ValueError
+    for anything that isn't a PNG.
+    """
+    before = path.stat().st_size
+    tmp_path = path.with_name(f".{path.name}.tmp")
+
+    try:
+        with Image.open(path) as im:
+            if im.format != "PNG":
+                raise ValueError(f"{path} is {im.format}, not PNG")
+            im.save(tmp_path, format="PNG", optimize=True, compress_level=9, **_png_metadata(im))
+
+        after = tmp_path.stat().st_size
+        if after >= before:
+            return 0
+
+        os.replace(tmp_path, path)
+        return before - after
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Losslessly recompress a reference PNG")
+    parser.add_argument("image", type=Path, help="PNG to recompress in place")
+    parser.add_argument("--upload", action="store_true", help=f"Copy the result to {R2_REFERENCE}")
+    args = parser.parse_args()
+
+    before = args.image.stat().st_size
+    try:
+        saved = precompress(args.image)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if saved:
+        print(f"✅ {args.image}: {before / 1024:.0f} KB → {(before - saved) / 1024:.0f} KB")
+    else:
+        print(f"⏭️  {args.image}: already as small as level 9 gets it")
+
+    if args.upload:
+        print(f"📤 Uploading to {R2_REFERENCE}")
+        subprocess.run(["rclone", "copy", str(args.image), R2_REFERENCE], check=True)
+        print("✅ Upload complete")
+
+
+if __name__ == "__main__":
+    main()
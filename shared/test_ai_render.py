@@ -17,10 +17,23 @@ Expected output:
 """
 
 import bpy
+import functools
+import heapq
+import importlib.util
+import logging
 import sys
 import os
 from pathlib import Path
 
+# Shared AI-Render helpers live in scripts/ next to this file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from ai_render_common import AI_RENDER_CONFIG, get_ai_ops, load_stability_key
+
+# Set up logging - bare messages on stdout; %-style arguments are only
+# formatted when a record is actually emitted
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
 # Test configuration
 TEST_CONFIG = {
     'provider': 'stability',
@@ -31,82 +44,99 @@ TEST_CONFIG = {
     'output': '/workspace/output/test_ai_render.png'
 }
 
+_ADDON_BASE = AI_RENDER_CONFIG.parent.parent
+
+# inspect_ai_render_addon: bpy.ops categories worth listing, and how many
+_OP_KEYWORDS = ('ai', 'render', 'dream')
+_MAX_LISTED_OPS = 20
+
+@functools.lru_cache(maxsize=64)
+def _ensure_dir(path_str):
+    """makedirs once per directory per process"""
+    os.makedirs(path_str, exist_ok=True)
+
 def test_ai_render_installed():
     """Check if AI Render addon is installed and enable it."""
-    print("=" * 60)
-    print("Test 1: Checking if AI Render is installed...")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("Test 1: Checking if AI Render is installed...")
+    logger.info("=" * 60)
+    
+    # 'AI-Render' is the module name the rest of this script uses - if it's
+    # already enabled there's nothing to probe
+    if 'AI-Render' in bpy.context.preferences.addons:
+        logger.info("  ✅ 'AI-Render' is already enabled")
+        return True
     
-    # Try to enable the addon (it might have different module names)
+    # Try to enable the addon (it might have different module names),
+    # known-good name first
     possible_names = ['AI-Render', 'ai_render', 'airender', 'ai-render']
     
     enabled = False
     for addon_name in possible_names:
         try:
-            print(f"  Trying to enable '{addon_name}'...")
+            logger.info("  Trying to enable '%s'...", addon_name)
             bpy.ops.preferences.addon_enable(module=addon_name)
-            print(f"  ✅ Successfully enabled '{addon_name}'")
+            logger.info("  ✅ Successfully enabled '%s'", addon_name)
             enabled = True
             break
         except Exception as e:
-            print(f"  ⚠️  Could not enable '{addon_name}': {e}")
+            logger.warning("  ⚠️  Could not enable '%s': %s", addon_name, e)
     
     if not enabled:
-        print(f"\n❌ Could not enable AI Render addon")
-        print("\nAvailable addons in directory:")
-        addon_dir = Path.home() / ".config/blender/4.0/scripts/addons"
+        logger.error("\n❌ Could not enable AI Render addon")
+        logger.info("\nAvailable addons in directory:")
+        addon_dir = _ADDON_BASE
         if addon_dir.exists():
             for item in addon_dir.iterdir():
                 if item.is_dir():
-                    print(f"  - {item.name}")
+                    logger.info("  - %s", item.name)
         
-        print("\nCurrently enabled addons:")
+        logger.info("\nCurrently enabled addons:")
         for addon in bpy.context.preferences.addons:
-            print(f"  - {addon}")
+            logger.info("  - %s", addon)
         return False
     
     return True
 
 def test_stability_api_key():
     """Check if Stability API key is configured."""
-    print("\n" + "=" * 60)
-    print("Test 2: Checking Stability API key...")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Test 2: Checking Stability API key...")
+    logger.info("=" * 60)
     
     # Try to read config file
-    config_path = Path.home() / ".config/blender/4.0/scripts/addons/AI-Render/config.py"
+    config_path = AI_RENDER_CONFIG
     
     if config_path.exists():
-        print(f"✅ Config file found: {config_path}")
+        logger.info("✅ Config file found: %s", config_path)
         
-        # Read and check for API key
-        with open(config_path) as f:
-            content = f.read()
-            if 'STABILITY_API_KEY' in content and 'sk-' in content:
-                print(f"✅ Stability API key appears to be set")
-                return True
-            else:
-                print(f"❌ Stability API key not found in config")
-                return False
+        # Check for API key
+        api_key = load_stability_key(config_path)
+        if api_key and api_key.startswith('sk-'):
+            logger.info("✅ Stability API key appears to be set")
+            return True
+        else:
+            logger.error("❌ Stability API key not found in config")
+            return False
     else:
-        print(f"❌ Config file not found at {config_path}")
+        logger.error("❌ Config file not found at %s", config_path)
         return False
 
 def test_generate_image():
     """Generate a simple test image using Stability AI."""
-    print("\n" + "=" * 60)
-    print("Test 3: Generating test image...")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Test 3: Generating test image...")
+    logger.info("=" * 60)
     
-    print(f"Provider: {TEST_CONFIG['provider']}")
-    print(f"Resolution: {TEST_CONFIG['resolution']}")
-    print(f"Steps: {TEST_CONFIG['steps']}")
-    print(f"Prompt: {TEST_CONFIG['prompt']}")
-    print(f"Output: {TEST_CONFIG['output']}")
+    logger.info("Provider: %s", TEST_CONFIG['provider'])
+    logger.info("Resolution: %s", TEST_CONFIG['resolution'])
+    logger.info("Steps: %s", TEST_CONFIG['steps'])
+    logger.info("Prompt: %s", TEST_CONFIG['prompt'])
+    logger.info("Output: %s", TEST_CONFIG['output'])
     
     # Create output directory
     output_path = Path(TEST_CONFIG['output'])
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(str(output_path.parent))
     
     try:
         # Configure AI Render addon preferences
@@ -114,80 +144,90 @@ def test_generate_image():
         prefs.sd_backend = 'dreamstudio'  # Uses Stability API
         
         # Read API key from config
-        config_path = Path.home() / ".config/blender/4.0/scripts/addons/AI-Render/config.py"
-        if config_path.exists():
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("ai_render_config", config_path)
-            config_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(config_module)
+        if AI_RENDER_CONFIG.exists():
+            api_key = load_stability_key(AI_RENDER_CONFIG)
             
-            if hasattr(config_module, 'STABILITY_API_KEY'):
-                prefs.dream_studio_api_key = config_module.STABILITY_API_KEY
-                print(f"✅ API key configured")
+            if api_key:
+                prefs.dream_studio_api_key = api_key
+                logger.info("✅ API key configured")
             else:
-                print(f"⚠️  No API key found in config")
+                logger.warning("⚠️  No API key found in config")
         
         # Configure scene properties
         scene = bpy.context.scene
-        scene.air_props.is_enabled = True
-        scene.air_props.auto_run = True  # Auto-process after render (CORRECT property name!)
-        # sd_model is already set to SDXL 1024 (the only option)
-        scene.air_props.prompt_text = TEST_CONFIG['prompt']
-        scene.air_props.negative_prompt_text = "ugly, bad art, blurry"
-        scene.air_props.steps = TEST_CONFIG['steps']
-        scene.air_props.cfg_scale = 7.0
-        scene.air_props.image_similarity = 0.0  # Pure text-to-image
-        scene.air_props.use_random_seed = False
-        scene.air_props.seed = 42
+        props = scene.air_props
+        settings = {
+            'is_enabled': True,
+            'auto_run': True,  # Auto-process after render (CORRECT property name!)
+            # sd_model is already set to SDXL 1024 (the only option)
+            'prompt_text': TEST_CONFIG['prompt'],
+            'negative_prompt_text': "ugly, bad art, blurry",
+            'steps': TEST_CONFIG['steps'],
+            'cfg_scale': 7.0,
+            'image_similarity': 0.0,  # Pure text-to-image
+            'use_random_seed': False,
+            'seed': 42,
+            # CRITICAL: Enable autosave so AI-generated images are saved to disk
+            'do_autosave_after_images': True,
+            'autosave_image_path': "/workspace/output/",  # Where to save AI images
+        }
+        for name, value in settings.items():
+            setattr(props, name, value)
         
-        # CRITICAL: Enable autosave so AI-generated images are saved to disk
-        scene.air_props.do_autosave_after_images = True
-        scene.air_props.autosave_image_path = "/workspace/output/"  # Where to save AI images
-        
-        print(f"\n🔧 Autosave configured:")
-        print(f"   do_autosave_after_images: {scene.air_props.do_autosave_after_images}")
-        print(f"   autosave_image_path: {scene.air_props.autosave_image_path}")
+        logger.info("\n🔧 Autosave configured:")
+        logger.info("   do_autosave_after_images: %s", props.do_autosave_after_images)
+        logger.info("   autosave_image_path: %s", props.autosave_image_path)
         
         # Set render resolution (MUST be multiple of 64, between 128-2048)
-        scene.render.resolution_x = TEST_CONFIG['resolution'][0]
-        scene.render.resolution_y = TEST_CONFIG['resolution'][1]
-        scene.render.resolution_percentage = 100  # CRITICAL: AI Render uses this in validation!
-        scene.render.filepath = str(output_path)
+        render = scene.render
+        render.resolution_x = TEST_CONFIG['resolution'][0]
+        render.resolution_y = TEST_CONFIG['resolution'][1]
+        render.resolution_percentage = 100  # CRITICAL: AI Render uses this in validation!
+        render.filepath = str(output_path)
         
-        print("\n🎨 Rendering with AI Render enabled...")
-        print("   This will make a real API call to Stability AI")
-        print("   Expected cost: ~$0.04 (1024x1024, 20 steps, SDXL)")
+        logger.info("\n🎨 Rendering with AI Render enabled...")
+        logger.info("   This will make a real API call to Stability AI")
+        logger.info("   Expected cost: ~$0.04 (1024x1024, 20 steps, SDXL)")
         
         # Render - this creates the 'Render Result' image but in headless mode it has no data
         bpy.ops.render.render(write_still=True)
         
         # Headless mode fix: Load rendered PNG and make it the 'Render Result'
-        print("   Fixing headless mode: Loading rendered image...")
+        logger.info("   Fixing headless mode: Loading rendered image...")
         
-        # Remove old Render Result (it has no data in headless)
-        if 'Render Result' in bpy.data.images:
-            bpy.data.images.remove(bpy.data.images['Render Result'])
+        # Render Result pixels can't be read headless, so the PNG has to be
+        # decoded either way. If an earlier run in this session already
+        # swapped in our file-backed image, reload it in place
+        render_result = bpy.data.images.get('Render Result')
+        if render_result is not None and not (
+                render_result.source == 'FILE'
+                and bpy.path.abspath(render_result.filepath) == str(output_path)):
+            # Remove old Render Result (it has no data in headless)
+            bpy.data.images.remove(render_result)
+            render_result = None
         
         # Load the saved render
         if output_path.exists():
-            render_result = bpy.data.images.load(str(output_path))
-            render_result.name = 'Render Result'
+            if render_result is not None:
+                render_result.reload()
+            else:
+                render_result = bpy.data.images.load(str(output_path))
+                render_result.name = 'Render Result'
             
             # CRITICAL: Call update() to set has_data=True
             render_result.update()
             
-            print(f"   ✅ Loaded and updated Render Result")
-            print(f"      has_data={render_result.has_data}, size={render_result.size[:]}")
+            logger.info("   ✅ Loaded and updated Render Result")
+            logger.info("      has_data=%s, size=%s", render_result.has_data, render_result.size[:])
         else:
-            print(f"   ❌ Could not find rendered file at {output_path}")
+            logger.error("   ❌ Could not find rendered file at %s", output_path)
             return False
         
         # Call AI Render's API function directly (bypasses task queue which requires event loop)
-        print("\n   🎨 Calling Stability AI API directly...")
-        print("   (This will take 30-90 seconds...)")
+        logger.info("\n   🎨 Calling Stability AI API directly...")
+        logger.info("   (This will take 30-90 seconds...)")
         
-        from importlib import import_module
-        operators_module = import_module('AI-Render.operators')
+        operators_module = get_ai_ops()
         
         # Do pre-API setup (sets various scene properties)
         operators_module.do_pre_api_setup(scene)
@@ -196,19 +236,19 @@ def test_generate_image():
         # Unlike the handler, this runs synchronously instead of being queued
         try:
             result = operators_module.sd_generate(scene)
-            print(f"\n   ✅ API call completed! (returned: {result})")
+            logger.info("\n   ✅ API call completed! (returned: %s)", result)
             
             # Check for errors in scene properties
-            if hasattr(scene, 'air_props'):
-                props = scene.air_props
-                if hasattr(props, 'error_key') and props.error_key:
-                    print(f"   ⚠️  Error key: {props.error_key}")
-                if hasattr(props, 'error_message') and props.error_message:
-                    print(f"   ⚠️  Error message: {props.error_message}")
-                if hasattr(props, 'last_generated_image_path') and props.last_generated_image_path:
-                    print(f"   📁 Last generated image: {props.last_generated_image_path}")
+            props = getattr(scene, 'air_props', None)
+            if props is not None:
+                for name, label in (('error_key', '⚠️  Error key'),
+                                    ('error_message', '⚠️  Error message'),
+                                    ('last_generated_image_path', '📁 Last generated image')):
+                    value = getattr(props, name, None)
+                    if value:
+                        logger.info("   %s: %s", label, value)
         except Exception as e:
-            print(f"\n   ❌ API call failed: {e}")
+            logger.error("\n   ❌ API call failed: %s", e)
             import traceback
             traceback.print_exc()
             return False
@@ -217,50 +257,59 @@ def test_generate_image():
         # AI Render saves images to the same directory as the render
         output_dir = output_path.parent
         
-        print("\n📂 Checking for AI-generated images...")
-        print(f"   Looking in: {output_dir}")
+        logger.info("\n📂 Checking for AI-generated images...")
+        logger.info("   Looking in: %s", output_dir)
         
-        # List all PNG files to see what was created
-        png_files = sorted(output_dir.glob("*.png"), key=lambda p: p.stat().st_mtime, reverse=True)
+        # List all PNG files to see what was created, stat-ing each once
+        with os.scandir(output_dir) as it:
+            png_files = []
+            for entry in it:
+                if entry.name.endswith('.png'):
+                    stat = entry.stat()
+                    png_files.append((stat.st_mtime, stat.st_size, entry.name))
         
         if len(png_files) > 1:
-            print(f"\n✅ Found {len(png_files)} images:")
-            for f in png_files[:5]:  # Show first 5
-                stat = f.stat()
-                print(f"   - {f.name} ({stat.st_size} bytes, modified {stat.st_mtime})")
+            logger.info("\n✅ Found %s images:", len(png_files))
+            # Only the 5 newest are shown - no need to sort the rest
+            newest_first = heapq.nlargest(5, png_files, key=lambda t: t[0])
+            for mtime, size, name in newest_first:
+                logger.info("   - %s (%s bytes, modified %s)", name, size, mtime)
             
             # The newest file should be the AI-generated one
-            newest = png_files[0]
-            print(f"\n🎨 Newest image (likely AI-generated): {newest.name}")
+            newest = newest_first[0][2]
+            logger.info("\n🎨 Newest image (likely AI-generated): %s", newest)
             return True
         else:
-            print(f"\n⚠️  Only found {len(png_files)} image(s) - AI generation may have failed")
+            logger.warning("\n⚠️  Only found %s image(s) - AI generation may have failed", len(png_files))
             
             # Check for errors in scene properties
-            if hasattr(scene, 'air_props'):
-                props = scene.air_props
-                if hasattr(props, 'error_message') and props.error_message:
-                    print(f"   Error: {props.error_message}")
+            error_message = getattr(getattr(scene, 'air_props', None), 'error_message', None)
+            if error_message:
+                logger.info("   Error: %s", error_message)
             
             return False
         
     except Exception as e:
-        print(f"\n❌ Error generating image: {e}")
+        logger.error("\n❌ Error generating image: %s", e)
         import traceback
         traceback.print_exc()
         return False
 
 def inspect_ai_render_addon():
     """Inspect AI Render addon to find available operators."""
-    print("\n" + "=" * 60)
-    print("Bonus: Inspecting AI Render addon...")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Bonus: Inspecting AI Render addon...")
+    logger.info("=" * 60)
     
     # List all operators that might be AI Render related
-    print("\nSearching for AI Render operators:")
+    logger.info("\nSearching for AI Render operators:")
     ai_render_ops = []
     for op_name in dir(bpy.ops):
-        if 'ai' in op_name.lower() or 'render' in op_name.lower() or 'dream' in op_name.lower():
+        # Only the first few are shown, so stop looking once we have them
+        if len(ai_render_ops) >= _MAX_LISTED_OPS:
+            break
+        lower = op_name.lower()
+        if any(keyword in lower for keyword in _OP_KEYWORDS):
             try:
                 op_module = getattr(bpy.ops, op_name)
                 for sub_op in dir(op_module):
@@ -269,32 +318,32 @@ def inspect_ai_render_addon():
                         ai_render_ops.append(full_name)
             except Exception as e:
                 # DNA Fix: Silent failure replaced with logging (likely non-accessible operator)
-                # print(f"      ⚠️  Error inspecting operator {op_name}: {e}")
-                pass
+                logger.debug("      ⚠️  Error inspecting operator %s: %s", op_name, e)
     
     if ai_render_ops:
-        print(f"\nFound {len(ai_render_ops)} potentially relevant operators:")
-        for op in ai_render_ops[:20]:  # Limit to first 20
-            print(f"  - {op}")
+        logger.info("\nFirst %s potentially relevant operators:", min(len(ai_render_ops), _MAX_LISTED_OPS))
+        for op in ai_render_ops[:_MAX_LISTED_OPS]:
+            logger.info("  - %s", op)
     else:
-        print("  No AI/render related operators found")
+        logger.info("  No AI/render related operators found")
     
-    # Try to import ai_render module if it exists
-    try:
+    # Import ai_render if it exists - looked up only now, after enabling
+    # the addon has put its directory on sys.path
+    if importlib.util.find_spec('ai_render') is None:
+        logger.warning("\n⚠️  Could not import ai_render module")
+    else:
         import ai_render
-        print(f"\n✅ AI Render module imported successfully")
-        print(f"   Available attributes:")
+        logger.info("\n✅ AI Render module imported successfully")
+        logger.info("   Available attributes:")
         for attr in dir(ai_render)[:20]:  # Limit to first 20
             if not attr.startswith('_'):
-                print(f"     - {attr}")
-    except ImportError:
-        print(f"\n⚠️  Could not import ai_render module")
+                logger.info("     - %s", attr)
 
 def main():
     """Run all tests."""
-    print("\n" + "🔬" * 30)
-    print("AI RENDER TEST SUITE")
-    print("🔬" * 30 + "\n")
+    logger.info("\n" + "🔬" * 30)
+    logger.info("AI RENDER TEST SUITE")
+    logger.info("🔬" * 30 + "\n")
     
     # Track results
     results = {
@@ -315,19 +364,19 @@ def main():
         results['image_generated'] = test_generate_image()
     
     # Summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    print(f"✅ AI Render Installed:    {results['addon_installed']}")
-    print(f"✅ API Key Configured:     {results['api_key_configured']}")
-    print(f"⚠️  Image Generated:        {results['image_generated']} (placeholder)")
+    logger.info("\n" + "=" * 60)
+    logger.info("TEST SUMMARY")
+    logger.info("=" * 60)
+    logger.info("✅ AI Render Installed:    %s", results['addon_installed'])
+    logger.info("✅ API Key Configured:     %s", results['api_key_configured'])
+    logger.info("⚠️  Image Generated:        %s (placeholder)", results['image_generated'])
     
     # Exit code
     if all(results.values()):
-        print("\n🎉 All tests passed!")
+        logger.info("\n🎉 All tests passed!")
         sys.exit(0)
     else:
-        print("\n⚠️  Some tests failed - see details above")
+        logger.warning("\n⚠️  Some tests failed - see details above")
         sys.exit(1)
 
 if __name__ == '__main__':
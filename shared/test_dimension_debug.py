@@ -6,6 +6,15 @@ import bpy
 import sys
 import os
 
+# SDXL-era AI Render limits: multiples of 64 in [128, 2048]
+MIN_DIM = 128
+MAX_DIM = 2048
+DIM_STEP = 64
+
+def _dim_valid(d):
+    """Arithmetic version of `d in range(MIN_DIM, MAX_DIM + DIM_STEP, DIM_STEP)`"""
+    return MIN_DIM <= d <= MAX_DIM and d % DIM_STEP == 0
+
 # Set up scene
 scene = bpy.context.scene
 scene.render.resolution_x = 512
@@ -41,11 +50,8 @@ try:
     print(f"   are_dimensions_valid(): {valid}")
     
     # Manual validation check
-    min_dim = 128
-    max_dim = 2048
-    step = 64
-    width_valid = width in range(min_dim, max_dim + step, step)
-    height_valid = height in range(min_dim, max_dim + step, step)
+    width_valid = _dim_valid(width)
+    height_valid = _dim_valid(height)
     
     print(f"\n✅ Manual validation:")
     print(f"   width ({width}) in range: {width_valid}")
@@ -1,7 +1,15 @@
-import re
+import functools
 import os
+import string
+from dataclasses import dataclass
 from pathlib import Path
 
+# One pass for safe_slug: spaces become underscores, every other ASCII
+# character outside [a-zA-Z0-9_-] is dropped
+_SLUG_ALLOWED = set(string.ascii_letters + string.digits + "-_")
+_SLUG_TABLE = {i: None for i in range(128) if chr(i) not in _SLUG_ALLOWED}
+_SLUG_TABLE[ord(" ")] = "_"
+
 def safe_slug(text: str) -> str:
     """
     Sanitize a string to be safe for filenames and path components.
@@ -12,27 +20,43 @@ def safe_slug(text: str) -> str:
         return ""
     # Remove any path traversal attempts
     text = os.path.basename(text)
-    # Replace spaces with underscores
-    text = text.replace(" ", "_")
-    # Remove non-alphanumeric/hyphen/underscore
-    return re.sub(r'[^a-zA-Z0-9\-_]', '', text)
+    # Drop non-ASCII, then replace spaces and remove anything that isn't
+    # alphanumeric/hyphen/underscore
+    return text.encode("ascii", "ignore").decode("ascii").translate(_SLUG_TABLE)
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the absolute path to the project root."""
+    """Get the absolute path to the project root (resolved once per process)."""
     return Path(__file__).resolve().parent.parent
 
+# Doppler naming convention: [PROJECT]_[VAR]
+_DOPPLER_PREFIX = "D3D_POSE_FACTORY_"
+
+@functools.lru_cache(maxsize=128)
 def get_env_var(name: str, default=None) -> str:
     """
     Get environment variable with Doppler-ready naming support.
     Will eventually support mapping generic names to project-specific ones.
+
+    Results are cached for the life of the process; call
+    get_env_var.cache_clear() after changing os.environ (e.g. in tests).
     """
-    # Doppler naming convention: [PROJECT]_[VAR]
-    doppler_name = f"D3D_POSE_FACTORY_{name}"
-    return os.getenv(doppler_name) or os.getenv(name) or default
+    return os.getenv(_DOPPLER_PREFIX + name) or os.getenv(name) or default
 
 # DNA Resilience: Centralized Constants to eliminate Magic Numbers
-SDXL_RESOLUTION = 1024
-EEVEE_RESOLUTION = 512
-DEFAULT_JOB_TIMEOUT = 3600
-DEFAULT_SSH_TIMEOUT = 300
-STABILITY_COST_PER_IMAGE = 0.04
+@dataclass(frozen=True, slots=True)
+class _Constants:
+    SDXL_RESOLUTION: int = 1024
+    EEVEE_RESOLUTION: int = 512
+    DEFAULT_JOB_TIMEOUT: int = 3600
+    DEFAULT_SSH_TIMEOUT: int = 300
+    STABILITY_COST_PER_IMAGE: float = 0.04
+
+CONSTANTS = _Constants()
+
+# Flat names kept for existing `from utils import X` callers
+SDXL_RESOLUTION = CONSTANTS.SDXL_RESOLUTION
+EEVEE_RESOLUTION = CONSTANTS.EEVEE_RESOLUTION
+DEFAULT_JOB_TIMEOUT = CONSTANTS.DEFAULT_JOB_TIMEOUT
+DEFAULT_SSH_TIMEOUT = CONSTANTS.DEFAULT_SSH_TIMEOUT
+STABILITY_COST_PER_IMAGE = CONSTANTS.STABILITY_COST_PER_IMAGE